@@ -49,7 +49,7 @@ def session_fixture(request):
             )
             summary["stat"]["teststeps"]["failures"] += 1
 
-        testcase_summary_json = testcase_summary.dict()
+        testcase_summary_json = testcase_summary.model_dump()
         testcase_summary_json["records"] = testcase_summary_json.pop("step_results")
         summary["details"].append(testcase_summary_json)
 
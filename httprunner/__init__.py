@@ -2,22 +2,53 @@ __version__ = "v4.3.5"
 __description__ = "One-stop solution for HTTP(S) testing."
 
 
-from httprunner.config import Config
-from httprunner.parser import parse_parameters as Parameters
-from httprunner.runner import HttpRunner
-from httprunner.step import Step
-from httprunner.step_request import RunRequest
-from httprunner.step_sql_request import (
-    RunSqlRequest,
-    StepSqlRequestExtraction,
-    StepSqlRequestValidation,
-)
-from httprunner.step_testcase import RunTestCase
-from httprunner.step_thrift_request import (
-    RunThriftRequest,
-    StepThriftRequestExtraction,
-    StepThriftRequestValidation,
-)
+import importlib
+
+# public symbols are imported lazily on first access (PEP 562),
+# so that `import httprunner` does not pull in requests/pydantic/thrift/sqlalchemy
+_LAZY_IMPORTS = {
+    "Config": ("httprunner.config", "Config"),
+    "Parameters": ("httprunner.parser", "parse_parameters"),
+    "HttpRunner": ("httprunner.runner", "HttpRunner"),
+    "Step": ("httprunner.step", "Step"),
+    "RunRequest": ("httprunner.step_request", "RunRequest"),
+    "RunSqlRequest": ("httprunner.step_sql_request", "RunSqlRequest"),
+    "StepSqlRequestExtraction": (
+        "httprunner.step_sql_request",
+        "StepSqlRequestExtraction",
+    ),
+    "StepSqlRequestValidation": (
+        "httprunner.step_sql_request",
+        "StepSqlRequestValidation",
+    ),
+    "RunTestCase": ("httprunner.step_testcase", "RunTestCase"),
+    "RunThriftRequest": ("httprunner.step_thrift_request", "RunThriftRequest"),
+    "StepThriftRequestExtraction": (
+        "httprunner.step_thrift_request",
+        "StepThriftRequestExtraction",
+    ),
+    "StepThriftRequestValidation": (
+        "httprunner.step_thrift_request",
+        "StepThriftRequestValidation",
+    ),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), attr_name)
+    # cache in module namespace, __getattr__ will not be called again for name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
 
 '''
 用于指定在使用 from package import * 导入时应该导出的符号（类、函数、变量等）。
@@ -5,6 +5,7 @@ import requests
 import urllib3
 from loguru import logger
 from requests import Request, Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import (
     InvalidSchema,
     InvalidURL,
@@ -12,11 +13,25 @@ from requests.exceptions import (
     RequestException,
 )
 
-from httprunner.models import RequestData, ResponseData
+from httprunner.models import MethodEnum, RequestData, ResponseData
 from httprunner.models import SessionData, ReqRespData
-from httprunner.utils import lower_dict_keys, omit_long_data
+from httprunner.utils import json_dumps, json_loads, omit_long_data
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+_insecure_warnings_disabled = False
+
+# process-wide connection pool, shared by all HttpSession instances,
+# so that keep-alive connections are reused across testcases
+SHARED_HTTP_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64)
+
+
+def disable_insecure_warnings():
+    """disable urllib3 InsecureRequestWarning once, when the first session is created"""
+    global _insecure_warnings_disabled
+    if _insecure_warnings_disabled:
+        return
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    _insecure_warnings_disabled = True
 
 
 class ApiResponse(Response):
@@ -26,26 +41,38 @@ class ApiResponse(Response):
         Response.raise_for_status(self)
 
 
+def _get_header(headers, name, default=""):
+    """get header value by case-insensitive name, without building a lowered copy"""
+    name = name.lower()
+    return next((v for k, v in headers.items() if k.lower() == name), default)
+
+
 def get_req_resp_record(resp_obj: Response) -> ReqRespData:
     """get request and response info from Response() object."""
 
     def log_print(req_or_resp, r_type):
-        msg = f"\n================== {r_type} details ==================\n"
-        for key, value in req_or_resp.dict().items():
-            if isinstance(value, dict) or isinstance(value, list):
-                value = json.dumps(value, indent=4, ensure_ascii=False)
+        def format_details():
+            lines = ["", f"================== {r_type} details =================="]
+            for key, value in req_or_resp.model_dump().items():
+                if isinstance(value, (dict, list)):
+                    value = json_dumps(value)
 
-            msg += "{:<8} : {}\n".format(key, value)
-        logger.debug(msg)
+                lines.append("{:<8} : {}".format(key, value))
+            lines.append("")
+            return "\n".join(lines)
+
+        # details are only formatted when DEBUG messages are handled
+        logger.opt(lazy=True).debug("{}", format_details)
 
     # record actual request info
-    request_headers = dict(resp_obj.request.headers)
-    request_cookies = resp_obj.request._cookies.get_dict()
+    request = resp_obj.request
+    request_headers = dict(request.headers)
+    request_cookies = request._cookies.get_dict()
 
-    request_body = resp_obj.request.body
+    request_body = request.body
     if request_body is not None:
         try:
-            request_body = json.loads(request_body)
+            request_body = json_loads(request_body)
         except json.JSONDecodeError:
             # str: a=1&b=2
             pass
@@ -56,14 +83,16 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
             # neither str nor bytes/bytearray, e.g. <MultipartEncoder>
             pass
 
-        request_content_type = lower_dict_keys(request_headers).get("content-type")
+        request_content_type = _get_header(request_headers, "content-type")
         if request_content_type and "multipart/form-data" in request_content_type:
             # upload file type
             request_body = "upload file stream (OMITTED)"
 
-    request_data = RequestData(
-        method=resp_obj.request.method,
-        url=resp_obj.request.url,
+    # records are built from requests' own data, which is already well-typed,
+    # thus skip pydantic validation and only convert mappings to plain dict
+    request_data = RequestData.model_construct(
+        method=MethodEnum(request.method),
+        url=request.url,
         headers=request_headers,
         cookies=request_cookies,
         body=request_body,
@@ -74,24 +103,29 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
 
     # record response info
     resp_headers = dict(resp_obj.headers)
-    lower_resp_headers = lower_dict_keys(resp_headers)
-    content_type = lower_resp_headers.get("content-type", "")
+    content_type = _get_header(resp_headers, "content-type")
 
     if "image" in content_type:
         # response is image type, record bytes content only
         response_body = resp_obj.content
     else:
+        # content is None when the request failed before getting any response
+        raw_content = resp_obj.content or b""
         try:
-            # try to record json data
-            response_body = resp_obj.json()
+            # try to record json data, decode raw bytes only once
+            response_body = json_loads(raw_content)
         except ValueError:
+            try:
+                resp_text = raw_content.decode(resp_obj.encoding or "utf-8", "replace")
+            except LookupError:
+                # unknown encoding
+                resp_text = raw_content.decode("utf-8", "replace")
             # only record at most 512 text charactors
-            resp_text = resp_obj.text
             response_body = omit_long_data(resp_text)
 
-    response_data = ResponseData(
+    response_data = ResponseData.model_construct(
         status_code=resp_obj.status_code,
-        cookies=resp_obj.cookies or {},
+        cookies=resp_obj.cookies.get_dict() if resp_obj.cookies else {},
         encoding=resp_obj.encoding,
         headers=resp_headers,
         content_type=content_type,
@@ -101,7 +135,9 @@ def get_req_resp_record(resp_obj: Response) -> ReqRespData:
     # log response details in debug mode
     log_print(response_data, "response")
 
-    req_resp_data = ReqRespData(request=request_data, response=response_data)
+    req_resp_data = ReqRespData.model_construct(
+        request=request_data, response=response_data
+    )
     return req_resp_data
 
 
@@ -120,16 +156,51 @@ class HttpSession(requests.Session):
         # 并且可以在多个请求之间保持某些参数（如 headers、cookies、auth 等）不变。
         # 当你需要发送多个请求到同一个服务器时，使用 Session 对象是特别有用的，因为它可以减少 TCP 连接的建立和关闭的开销，从而提高性能
         super(HttpSession, self).__init__()
+        disable_insecure_warnings()
+        self.mount("https://", SHARED_HTTP_ADAPTER)
+        self.mount("http://", SHARED_HTTP_ADAPTER)
+        # get client/server IP/Port before response content is consumed,
+        # thus the response does not need to be streamed
+        self.hooks["response"].append(self._record_address)
         # 初始化请求模型request session data, including request, response, validators and stat data
-        self.data = SessionData()
+        self.data = SessionData.model_construct()
+
+    def _record_address(self, response, *args, **kwargs):
+        """response hook, record client/server address of the underlying connection.
+        it is called before response content is read and the connection is released.
+        """
+        if response.is_redirect:
+            # connection of redirect response is released when resolving redirects,
+            # only the address of final response is recorded
+            return
+
+        try:
+            sock = response.raw._connection.sock
+        except Exception:
+            return
+
+        try:
+            client_ip, client_port = sock.getsockname()
+            self.data.address.client_ip = client_ip
+            self.data.address.client_port = client_port
+            logger.debug(f"client IP: {client_ip}, Port: {client_port}")
+        except Exception:
+            pass
+
+        try:
+            server_ip, server_port = sock.getpeername()
+            self.data.address.server_ip = server_ip
+            self.data.address.server_port = server_port
+            logger.debug(f"server IP: {server_ip}, Port: {server_port}")
+        except Exception:
+            pass
 
     def update_last_req_resp_record(self, resp_obj):
         """
         update request and response info from Response() object.
         """
         # TODO: fix
-        self.data.req_resps.pop()
-        self.data.req_resps.append(get_req_resp_record(resp_obj))
+        self.data.req_resps[-1] = get_req_resp_record(resp_obj)
 
     def request(self, method, url, name=None, **kwargs):
         """
@@ -171,38 +242,22 @@ class HttpSession(requests.Session):
             if String, path to ssl client cert file (.pem). If Tuple, ('cert', 'key') pair.
         """
         # 这里data后面添加完请求信息干啥用了呢？赋值给step_request里的session_data了
-        self.data = SessionData()
+        # session data is referenced by the previous step result, thus it can not be
+        # reset in place; all fields are defaults, so skip pydantic validation
+        self.data = SessionData.model_construct()
 
         # timeout default to 120 seconds
         # setdefault，如果该键已经存在，则不会改变其值；如果该键不存在，则设置其值
         kwargs.setdefault("timeout", 120)
 
-        # set stream to True, in order to get client/server IP/Port
-        kwargs["stream"] = True
-
-        start_timestamp = time.time()
+        # monotonic clock is not affected by system time adjustments
+        start_ns = time.monotonic_ns()
         response = self._send_request_safe_mode(method, url, **kwargs)
         # 以ms为单位，四舍五入保留两位小数
-        response_time_ms = round((time.time() - start_timestamp) * 1000, 2)
-
-        try:
-            client_ip, client_port = response.raw._connection.sock.getsockname()
-            self.data.address.client_ip = client_ip
-            self.data.address.client_port = client_port
-            logger.debug(f"client IP: {client_ip}, Port: {client_port}")
-        except Exception:
-            pass
-
-        try:
-            server_ip, server_port = response.raw._connection.sock.getpeername()
-            self.data.address.server_ip = server_ip
-            self.data.address.server_port = server_port
-            logger.debug(f"server IP: {server_ip}, Port: {server_port}")
-        except Exception:
-            pass
+        response_time_ms = round((time.monotonic_ns() - start_ns) / 1_000_000, 2)
 
         # get length of the response content
-        content_size = int(dict(response.headers).get("content-length") or 0)
+        content_size = int(response.headers.get("content-length") or 0)
 
         # record the consumed time
         self.data.stat.response_time_ms = response_time_ms
@@ -211,12 +266,10 @@ class HttpSession(requests.Session):
         self.data.stat.content_size = content_size
 
         # record request and response histories, include 30X redirection
-        # 创建一个包含所有重定向响应（包括最终响应）的列表
-        response_list = response.history + [response]
         # 记录每个请求的请求模型和响应模型内容
-        self.data.req_resps = [
-            get_req_resp_record(resp_obj) for resp_obj in response_list
-        ]
+        req_resps = [get_req_resp_record(resp_obj) for resp_obj in response.history]
+        req_resps.append(get_req_resp_record(response))
+        self.data.req_resps = req_resps
 
         try:
             # 检查HTTP响应的状态码，如果响应状态码表示发生了错误（即不是200-299范围内的状态码），则抛出一个HTTPError异常
@@ -95,6 +95,10 @@ class Config(object):
         self.__name: Text = name
         self.__base_url: Text = ""
         self.__variables: VariablesMapping = {}
+        # variables are only copied into config struct when changed,
+        # or when config struct variables have been replaced, e.g. parsed by runner
+        self.__variables_dirty: bool = True
+        self.__struct_variables: VariablesMapping = None
         self.__config = TConfig(name=name, path=caller_frame.filename)
 
     @property
@@ -107,6 +111,7 @@ class Config(object):
 
     def variables(self, **variables) -> "Config":
         self.__variables.update(variables)
+        self.__variables_dirty = True
         return self
 
     def base_url(self, base_url: Text) -> "Config":
@@ -140,4 +145,11 @@ class Config(object):
         # 笑死了，这是把__init__里忘记的事情在这给补上了吗
         self.__config.name = self.__name
         self.__config.base_url = self.__base_url
-        self.__config.variables = copy.copy(self.__variables)
+        if (
+            self.__variables_dirty
+            or self.__config.variables is not self.__struct_variables
+        ):
+            # config struct variables should not be mutated in place by runner
+            self.__struct_variables = copy.copy(self.__variables)
+            self.__config.variables = self.__struct_variables
+            self.__variables_dirty = False
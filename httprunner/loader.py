@@ -1,10 +1,13 @@
+import copy
 import csv
+import functools
 import importlib
 import json
 import os
+import re
 import sys
 import types
-from typing import Callable, Dict, List, Text, Tuple, Union
+from typing import Any, Callable, Dict, List, Text, Tuple, Union
 
 import yaml
 from loguru import logger
@@ -13,15 +16,40 @@ from pydantic import ValidationError
 from httprunner import builtin, exceptions, utils
 from httprunner.models import ProjectMeta, TestCase
 
+try:
+    # libyaml C bindings, much faster than the pure python loader
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# each line in .env file: blank, comment, key=value, key:value (no "=" in line)
+dot_env_line_regex_compile = re.compile(
+    rb"^[ \t]*(?:"
+    rb"#.*"
+    rb"|(?P<eq_key>[^=\r\n]*?)[ \t]*=[ \t]*(?P<eq_value>.*?)"
+    rb"|(?P<colon_key>[^:=\r\n]*?)[ \t]*:[ \t]*(?P<colon_value>[^=\r\n]*?)"
+    rb"|(?P<invalid>[^ \t\r\n].*?)"
+    rb")[ \t\r]*$",
+    re.M,
+)
+
 # ruuner里初始化的self__project_meta就是这里的project_meta，使用load_project_meta生成的
 project_meta: Union[ProjectMeta, None] = None
+# loaded project meta for each project root directory
+project_meta_cache: Dict[Text, ProjectMeta] = {}
 
 
 def _load_yaml_file(yaml_file: Text) -> Dict:
     """load yaml file and check file content format"""
     with open(yaml_file, mode="rb") as stream:
         try:
-            yaml_content = yaml.load(stream, Loader=yaml.FullLoader)
+            try:
+                yaml_content = yaml.load(stream, Loader=YamlLoader)
+            except yaml.constructor.ConstructorError:
+                # tags not supported by safe loader, e.g. !!python/tuple,
+                # load with FullLoader as before
+                stream.seek(0)
+                yaml_content = yaml.load(stream, Loader=yaml.FullLoader)
         except yaml.YAMLError as ex:
             err_msg = f"YAMLError:\nfile: {yaml_file}\nerror: {ex}"
             logger.error(err_msg)
@@ -34,7 +62,7 @@ def _load_json_file(json_file: Text) -> Dict:
     """load json file and check file content format"""
     with open(json_file, mode="rb") as data_file:
         try:
-            json_content = json.load(data_file)
+            json_content = utils.json_loads(data_file.read())
         except json.JSONDecodeError as ex:
             err_msg = f"JSONDecodeError:\nfile: {json_file}\nerror: {ex}"
             raise exceptions.FileFormatError(err_msg)
@@ -48,23 +76,50 @@ def load_test_file(test_file: Text) -> Dict:
         raise exceptions.FileNotFound(f"test file not exists: {test_file}")
 
     file_suffix = os.path.splitext(test_file)[1].lower()
-    if file_suffix == ".json":
-        test_file_content = _load_json_file(test_file)
-    elif file_suffix in [".yaml", ".yml"]:
-        test_file_content = _load_yaml_file(test_file)
-    else:
+    if file_suffix not in [".json", ".yaml", ".yml"]:
         # '' or other suffix
         raise exceptions.FileFormatError(
             f"testcase/testsuite file should be YAML/JSON format, invalid format file: {test_file}"
         )
 
-    return test_file_content
+    abs_path = os.path.abspath(test_file)
+    # file mtime is part of the cache key, thus modified file will be reloaded
+    mtime_ns = os.stat(abs_path).st_mtime_ns
+    # return a copy, in case the cached content is mutated by the caller
+    return copy.deepcopy(_load_test_file_cached(abs_path, mtime_ns))
+
+
+def _intern_keys(content: Any) -> Any:
+    """intern dict keys in loaded content recursively, so that model field lookups
+    on them are resolved by identity comparison
+    """
+    if isinstance(content, dict):
+        return {
+            sys.intern(key) if isinstance(key, str) else key: _intern_keys(value)
+            for key, value in content.items()
+        }
+    elif isinstance(content, list):
+        return [_intern_keys(item) for item in content]
+    else:
+        return content
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_test_file_cached(test_file: Text, mtime_ns: int) -> Dict:
+    """load test file content, cached by file path and mtime"""
+    if test_file.lower().endswith(".json"):
+        test_content = _load_json_file(test_file)
+    else:
+        test_content = _load_yaml_file(test_file)
+
+    # interned once per file load, deepcopy of cached content keeps the same keys
+    return _intern_keys(test_content)
 
 
 def load_testcase(testcase: Dict) -> TestCase:
     try:
         # validate with pydantic TestCase model
-        testcase_obj = TestCase.parse_obj(testcase)
+        testcase_obj = TestCase.model_validate(testcase)
     except ValidationError as ex:
         err_msg = f"TestCase ValidationError:\nerror: {ex}\ncontent: {testcase}"
         raise exceptions.TestCaseFormatError(err_msg)
@@ -106,24 +161,22 @@ def load_dot_env_file(dot_env_path: Text) -> Dict:
     env_variables_mapping = {}
 
     with open(dot_env_path, mode="rb") as fp:
-        for line in fp:
-            # maxsplit=1
-            # 去除每行两边的空白字符
-            line = line.strip()
-            # 如果行为空或以 # 开头，则跳过。
-            if not len(line) or line.startswith(b"#"):
-                continue
-            if b"=" in line:
-                # 1代表maxsplit，只拆分一次，.split(b"=")将会按字节=进行拆分，b是字节的意思，不会去处理普通unicode字符"="
-                variable, value = line.split(b"=", 1)
-            elif b":" in line:
-                variable, value = line.split(b":", 1)
-            else:
-                raise exceptions.FileFormatError(".env format error")
-
-            env_variables_mapping[
-                variable.strip().decode("utf-8")
-            ] = value.strip().decode("utf-8")
+        content = fp.read()
+
+    # match all lines at once, instead of stripping and splitting line by line
+    for matched in dot_env_line_regex_compile.finditer(content):
+        if matched.group("invalid") is not None:
+            raise exceptions.FileFormatError(".env format error")
+
+        if matched.group("eq_key") is not None:
+            variable, value = matched.group("eq_key", "eq_value")
+        elif matched.group("colon_key") is not None:
+            variable, value = matched.group("colon_key", "colon_value")
+        else:
+            # comment line
+            continue
+
+        env_variables_mapping[variable.decode("utf-8")] = value.decode("utf-8")
 
     # 设置环境变量到当前Python进程的环境中，这些环境变量只会在当前进程及其子进程中生效，不会影响父进程或其他并行的进程
     utils.set_os_environ(env_variables_mapping)
@@ -170,14 +223,28 @@ def load_csv_file(csv_file: Text) -> List[Dict]:
         # file path not exist
         raise exceptions.CSVNotFound(csv_file)
 
-    csv_content_list = []
-
     with open(csv_file, encoding="utf-8") as csvfile:
         # 从CSV文件中读取数据，并将每一行数据作为一个字典返回，其中字典的键是CSV文件的列标题
-        reader = csv.DictReader(csvfile)
+        # read header only once and zip it with each row, faster than csv.DictReader
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        header_length = len(header)
+        csv_content_list = []
         for row in reader:
+            if not row:
+                continue
+
             # row['username'],row['password']
-            csv_content_list.append(row)
+            row_dict = dict(zip(header, row))
+            row_length = len(row)
+            # ragged rows are kept the same as csv.DictReader
+            if row_length < header_length:
+                for key in header[row_length:]:
+                    row_dict[key] = None
+            elif row_length > header_length:
+                row_dict[None] = row[header_length:]
+
+            csv_content_list.append(row_dict)
 
     return csv_content_list
 
@@ -203,22 +270,29 @@ def load_folder_files(folder_path: Text, recursive: bool = True) -> List:
         return []
 
     file_list = []
+    # walk top-down with an explicit stack, DirEntry caches file type info
+    dir_stack = [folder_path]
 
-    for dirpath, dirnames, filenames in os.walk(folder_path):
-        filenames_list = []
-
-        for filename in filenames:
-            if not filename.lower().endswith((".yml", ".yaml", ".json", "_test.py")):
-                continue
-
-            filenames_list.append(filename)
-
-        for filename in filenames_list:
-            file_path = os.path.join(dirpath, filename)
-            file_list.append(file_path)
-
-        if not recursive:
-            break
+    while dir_stack:
+        dirpath = dir_stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            # same as os.walk, ignore unreadable directories
+            continue
+
+        sub_dirs = []
+        for entry in entries:
+            if entry.is_dir():
+                # do not follow symlinks to directories, same as os.walk
+                if recursive and not entry.is_symlink():
+                    sub_dirs.append(entry.path)
+            elif entry.name.lower().endswith((".yml", ".yaml", ".json", "_test.py")):
+                file_list.append(entry.path)
+
+        # keep the same order as os.walk
+        dir_stack.extend(reversed(sub_dirs))
 
     return file_list
 
@@ -259,7 +333,7 @@ def load_builtin_functions() -> Dict[Text, Callable]:
 
 def locate_file(start_path: Text, file_name: Text) -> Text:
     """locate filename and return absolute file path.
-        searching will be recursive upward until system root dir.
+        searching will be upward until system root dir.
 
     Args:
         file_name (str): target locate file name
@@ -281,21 +355,22 @@ def locate_file(start_path: Text, file_name: Text) -> Text:
     else:
         raise exceptions.FileNotFound(f"invalid path: {start_path}")
 
-    file_path = os.path.join(start_dir_path, file_name)
-    if os.path.isfile(file_path):
-        # ensure absolute 返回绝对路径
-        return os.path.abspath(file_path)
+    # locate upward iteratively until system root dir
+    while True:
+        file_path = os.path.join(start_dir_path, file_name)
+        if os.path.isfile(file_path):
+            # ensure absolute 返回绝对路径
+            return os.path.abspath(file_path)
 
-    # system root dir
-    # Windows, e.g. 'E:\\'
-    # Linux/Darwin, '/'
-    parent_dir = os.path.dirname(start_dir_path)
-    # 如果找到系统根目录仍然找不到debugtalk.py文件，抛出异常，调用这个方法的程序需要捕捉异常处理异常，或者继续向上抛出异常
-    if parent_dir == start_dir_path:
-        raise exceptions.FileNotFound(f"{file_name} not found in {start_path}")
+        # system root dir
+        # Windows, e.g. 'E:\\'
+        # Linux/Darwin, '/'
+        parent_dir = os.path.dirname(start_dir_path)
+        # 如果找到系统根目录仍然找不到debugtalk.py文件，抛出异常，调用这个方法的程序需要捕捉异常处理异常，或者继续向上抛出异常
+        if parent_dir == start_dir_path:
+            raise exceptions.FileNotFound(f"{file_name} not found in {start_path}")
 
-    # locate recursive upward
-    return locate_file(parent_dir, file_name)
+        start_dir_path = parent_dir
 
 
 def locate_debugtalk_py(start_path: Text) -> Text:
@@ -328,6 +403,14 @@ def locate_project_root_directory(test_path: Text) -> Tuple[Text, Text]:
         (str, str): debugtalk.py path, project_root_directory
 
     """
+    # relative test path and project root fallback depend on working directory
+    return _locate_project_root_directory(test_path, os.getcwd())
+
+
+@functools.lru_cache(maxsize=256)
+def _locate_project_root_directory(test_path: Text, cwd: Text) -> Tuple[Text, Text]:
+    """located once for each test path, avoid walking up the directory tree
+    for every testcase instance"""
 
     # 如果path是相对路径，先转换成绝对路径
     def prepare_path(path):
@@ -338,7 +421,7 @@ def locate_project_root_directory(test_path: Text) -> Tuple[Text, Text]:
         # 如果path不是绝对路径
         if not os.path.isabs(path):
             # os.getcwd()获取当前工作目录
-            path = os.path.join(os.getcwd(), path)
+            path = os.path.join(cwd, path)
 
         return path
 
@@ -353,15 +436,22 @@ def locate_project_root_directory(test_path: Text) -> Tuple[Text, Text]:
         project_root_directory = os.path.dirname(debugtalk_path)
     else:
         # debugtalk.py not found, use os.getcwd() as project RootDir.
-        project_root_directory = os.getcwd()
+        project_root_directory = cwd
 
     return debugtalk_path, project_root_directory
 
 
-def load_debugtalk_functions() -> Dict[Text, Callable]:
+# debugtalk.py functions loaded last time, with its file path and mtime
+debugtalk_cache: Dict[Text, Any] = {"path": None, "mtime": None, "functions": None}
+
+
+def load_debugtalk_functions(debugtalk_path: Text = None) -> Dict[Text, Callable]:
     """load project debugtalk.py module functions
         debugtalk.py should be located in project root directory.
 
+    Args:
+        debugtalk_path (str): located debugtalk.py file path, default to module file
+
     Returns:
         dict: debugtalk module functions mapping
             {
@@ -370,6 +460,19 @@ def load_debugtalk_functions() -> Dict[Text, Callable]:
             }
 
     """
+    # module may be imported by previous project, which should be reloaded
+    imported_module = sys.modules.get("debugtalk")
+    if (
+        imported_module is not None
+        and debugtalk_path
+        and getattr(imported_module, "__file__", None)
+        and os.path.abspath(imported_module.__file__) != os.path.abspath(debugtalk_path)
+    ):
+        # debugtalk.py of another project, import it from scratch instead of
+        # reloading, otherwise functions of the previous project are left over
+        del sys.modules["debugtalk"]
+    is_imported = "debugtalk" in sys.modules
+
     # load debugtalk.py module
     try:
         # 因为前面我们把debugtalk所在目录作为根目录添加进了python解释器路径里，所以可以直接debugtalk导入
@@ -380,17 +483,37 @@ def load_debugtalk_functions() -> Dict[Text, Callable]:
         logger.error(f"error occurred in debugtalk.py: {ex}")
         sys.exit(1)
 
-    # reload to refresh previously loaded module
-    # 当你对一个模块进行修改后，如果想要立即生效而不必重新启动Python解释器
-    # 这个函数可能会引发一些副作用，因为它会在运行时改变模块的状态，可能会影响到其他代码的执行。
-    imported_module = importlib.reload(imported_module)
-    return load_module_functions(imported_module)
+    debugtalk_path = debugtalk_path or getattr(imported_module, "__file__", None)
+    try:
+        mtime = os.stat(debugtalk_path).st_mtime_ns
+    except (OSError, TypeError):
+        mtime = None
+
+    # same debugtalk.py file unchanged since last load, skip reloading
+    if (
+        mtime is not None
+        and debugtalk_cache["path"] == debugtalk_path
+        and debugtalk_cache["mtime"] == mtime
+    ):
+        return dict(debugtalk_cache["functions"])
+
+    if is_imported:
+        # reload to refresh previously loaded module
+        # 当你对一个模块进行修改后，如果想要立即生效而不必重新启动Python解释器
+        # 这个函数可能会引发一些副作用，因为它会在运行时改变模块的状态，可能会影响到其他代码的执行。
+        imported_module = importlib.reload(imported_module)
+
+    functions = load_module_functions(imported_module)
+    debugtalk_cache.update(path=debugtalk_path, mtime=mtime, functions=functions)
+    return dict(functions)
 
 
 def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
     """load testcases, .env, debugtalk.py functions.
         testcases folder is relative to project_root_directory
-        by default, project_meta will be loaded only once, unless set reload to true.
+        by default, project_meta of each project root directory is loaded only once
+        and cached, unless set reload to true. the module-level project_meta always
+        points to the most recently used project.
 
     Args:
         test_path (str): test file/folder path, locate project RootDir from this path.
@@ -402,14 +525,10 @@ def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
 
     """
     global project_meta  # 声明这里的变量不是重新定义的函数内局部变量，而是直接用的模块loader.py的全局变量
-    # project_meta默认只设置一次，除非reload是true
-    if project_meta and (not reload):
-        return project_meta
-
-    project_meta = ProjectMeta()  # 项目初始化模型，包括环境变量路径和内容，debugtalk.py路径和内容，debugtalk.py里的function,
-    # 还有项目根目录绝对路径，以debugtalk所在目录为项目根目录project_root_directory，没有则是当前项目工作目录
-
     if not test_path:
+        # no test path specified, use the most recently loaded project
+        if reload or project_meta is None:
+            project_meta = ProjectMeta()
         return project_meta
 
     # 从用例*_test文件所在目录不停向上直到系统根目录是否存在debugtalk.py文件，以debugtalk所在目录为项目根目录project_root_directory
@@ -417,8 +536,20 @@ def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
     # debugtalk_path='/Users/guoyan/work/pythonProject/httprunner/examples/postman_echo/debugtalk.py'
     # project_root_directory='/Users/guoyan/work/pythonProject/httprunner/examples/postman_echo'
     # 如果debugtalk.py=none,project_root_directory是当前项目工作目录
+    if reload:
+        # debugtalk.py may have been added or removed since last located
+        _locate_project_root_directory.cache_clear()
     debugtalk_path, project_root_directory = locate_project_root_directory(test_path)
 
+    # project_meta默认只设置一次，除非reload是true
+    # project in the same root directory has been loaded before
+    if not reload and project_root_directory in project_meta_cache:
+        project_meta = project_meta_cache[project_root_directory]
+        return project_meta
+
+    project_meta = ProjectMeta()  # 项目初始化模型，包括环境变量路径和内容，debugtalk.py路径和内容，debugtalk.py里的function,
+    # 还有项目根目录绝对路径，以debugtalk所在目录为项目根目录project_root_directory，没有则是当前项目工作目录
+
     # add project RootDir to sys.path
     # 注意是sys.path不是os.path，是Python 解释器的搜索路径，索引0确保该路径优先于其他路径
     sys.path.insert(0, project_root_directory)
@@ -437,7 +568,7 @@ def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
 
     if debugtalk_path:
         # load debugtalk.py functions
-        debugtalk_functions = load_debugtalk_functions()
+        debugtalk_functions = load_debugtalk_functions(debugtalk_path)
     else:
         debugtalk_functions = {}
 
@@ -446,6 +577,7 @@ def load_project_meta(test_path: Text, reload: bool = False) -> ProjectMeta:
     project_meta.functions = debugtalk_functions
     project_meta.debugtalk_path = debugtalk_path
 
+    project_meta_cache[project_root_directory] = project_meta
     return project_meta
 
 
@@ -458,7 +590,9 @@ def convert_relative_project_root_dir(abs_path: Text) -> Text:
     Returns: relative path based on project_meta.RootDir
 
     """
-    _project_meta = load_project_meta(abs_path)
+    # abs_path may not exist yet, e.g. python testcase file to be generated,
+    # thus convert it based on the most recently loaded project
+    _project_meta = project_meta or load_project_meta(abs_path)
     if not abs_path.startswith(_project_meta.RootDir):
         raise exceptions.ParamsError(
             f"failed to convert absolute path to relative path based on project_meta.RootDir\n"
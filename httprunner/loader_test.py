@@ -1,4 +1,6 @@
 import os
+import sys
+import tempfile
 import unittest
 
 from httprunner import exceptions, loader
@@ -13,6 +15,76 @@ class TestLoader(unittest.TestCase):
         )
         self.assertEqual(len(testcase_obj.teststeps), 4)
 
+    def test_load_test_file_interned_keys(self):
+        path = "examples/postman_echo/request_methods/request_with_variables.yml"
+        test_content = loader.load_test_file(path)
+        for key in test_content["teststeps"][0]:
+            self.assertIs(key, sys.intern(key))
+
+    def test_load_testcase_boolean_param(self):
+        testcase_obj = loader.load_testcase(
+            {
+                "config": {"name": "boolean param"},
+                "teststeps": [
+                    {
+                        "name": "get with boolean param",
+                        "request": {
+                            "method": "GET",
+                            "url": "/get",
+                            "params": {"a": True, "b": 1},
+                        },
+                    }
+                ],
+            }
+        )
+        self.assertEqual(
+            testcase_obj.teststeps[0].request.params, {"a": "True", "b": "1"}
+        )
+
+    def test_load_project_meta_multiple_projects(self):
+        origin_project_meta = loader.project_meta
+        origin_sys_path = list(sys.path)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            project_dirs = {}
+            for name in ["a", "b"]:
+                project_dir = os.path.join(tmp_dir, name)
+                os.makedirs(project_dir)
+                with open(os.path.join(project_dir, "debugtalk.py"), "w") as f:
+                    f.write(f"def f{name}():\n    return '{name}'\n")
+                project_dirs[name] = project_dir
+
+            try:
+                project_meta_a = loader.load_project_meta(project_dirs["a"])
+                self.assertEqual(project_meta_a.RootDir, project_dirs["a"])
+                self.assertIn("fa", project_meta_a.functions)
+
+                project_meta_b = loader.load_project_meta(project_dirs["b"])
+                self.assertEqual(project_meta_b.RootDir, project_dirs["b"])
+                self.assertIn("fb", project_meta_b.functions)
+                self.assertNotIn("fa", project_meta_b.functions)
+                self.assertIs(loader.project_meta, project_meta_b)
+
+                # switching back to a loaded project returns the cached one
+                self.assertIs(
+                    loader.load_project_meta(project_dirs["a"]), project_meta_a
+                )
+                self.assertIs(loader.project_meta, project_meta_a)
+            finally:
+                for project_dir in project_dirs.values():
+                    loader.project_meta_cache.pop(project_dir, None)
+                loader.project_meta = origin_project_meta
+                sys.path[:] = origin_sys_path
+
+    def test_load_yaml_file_python_tuple_tag(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            yaml_file_path = os.path.join(tmp_dir, "tuple.yml")
+            with open(yaml_file_path, "w", encoding="utf-8") as f:
+                f.write("a: !!python/tuple [1, 2]\nb: 3\n")
+
+            yaml_content = loader._load_yaml_file(yaml_file_path)
+
+        self.assertEqual(yaml_content, {"a": (1, 2), "b": 3})
+
     def test_load_json_file_file_format_error(self):
         json_tmp_file = "tmp.json"
         # create empty file
@@ -69,6 +141,23 @@ class TestLoader(unittest.TestCase):
             ],
         )
 
+    def test_load_csv_file_ragged_rows(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_file_path = os.path.join(tmp_dir, "account.csv")
+            with open(csv_file_path, "w", encoding="utf-8") as f:
+                f.write("user,pwd\nu1,p1\nu2\nu3,p3,extra\n")
+
+            csv_content = loader.load_csv_file(csv_file_path)
+
+        self.assertEqual(
+            csv_content,
+            [
+                {"user": "u1", "pwd": "p1"},
+                {"user": "u2", "pwd": None},
+                {"user": "u3", "pwd": "p3", None: ["extra"]},
+            ],
+        )
+
     def test_load_folder_files(self):
         folder = os.path.join(os.getcwd(), "examples")
         file1 = os.path.join(os.getcwd(), "examples", "test_utils.py")
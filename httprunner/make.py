@@ -96,7 +96,12 @@ def __ensure_absolute(path: Text) -> Text:
         path = path[3:]
 
     path = ensure_path_sep(path)
-    project_meta = load_project_meta(path)
+    if os.path.exists(path):
+        project_meta = load_project_meta(path)
+    else:
+        # path relative to project root directory, e.g. referenced testcase,
+        # based on the most recently loaded project
+        project_meta = load_project_meta("")
 
     if os.path.isabs(path):
         absolute_path = path
@@ -1,26 +1,42 @@
 import os
-from enum import Enum
-from typing import Any, Callable, Dict, List, Text, Union
+from enum import Enum, IntEnum
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
 
-Name = Text
-Url = Text
-BaseUrl = Union[HttpUrl, Text]
-VariablesMapping = Dict[Text, Any]
+try:
+    from typing import Annotated
+except ImportError:  # python 3.7
+    from typing_extensions import Annotated
+
+
+def _bool_to_str(value: Any) -> Any:
+    """convert booleans in text fields as pydantic v1 did, e.g. True => 'True'"""
+    if isinstance(value, bool):
+        return str(value)
+    return value
+
+
+# str accepting booleans, numbers are coerced by coerce_numbers_to_str of each model
+LenientStr = Annotated[str, BeforeValidator(_bool_to_str)]
+
+Name = LenientStr
+Url = LenientStr
+BaseUrl = LenientStr
+VariablesMapping = Dict[str, Any]
 # 定义类型别名，Callable表示可调用的对象，如函数、方法、类
-FunctionsMapping = Dict[Text, Callable]
-Headers = Dict[Text, Text]
-Cookies = Dict[Text, Text]
+FunctionsMapping = Dict[str, Callable]
+Headers = Dict[str, LenientStr]
+Cookies = Dict[str, LenientStr]
 Verify = bool
-Hooks = List[Union[Text, Dict[Text, Text]]]
-Export = List[Text]
+Hooks = List[Union[LenientStr, Dict[str, LenientStr]]]
+Export = List[LenientStr]
 Validators = List[Dict]
-Env = Dict[Text, Any]
+Env = Dict[str, Any]
 
 
-# 该类继承自 Text 和 Enum
-class MethodEnum(Text, Enum):
+# 该类继承自 str 和 Enum
+class MethodEnum(str, Enum):
     GET = "GET"
     POST = "POST"
     PUT = "PUT"
@@ -30,14 +46,14 @@ class MethodEnum(Text, Enum):
     PATCH = "PATCH"
 
 
-class ProtoType(Enum):
+class ProtoType(IntEnum):
     Binary = 1
     CyBinary = 2
     Compact = 3
     Json = 4
 
 
-class TransType(Enum):
+class TransType(IntEnum):
     Buffered = 1
     CyBuffered = 2
     Framed = 3
@@ -46,33 +62,37 @@ class TransType(Enum):
 
 # configs for thrift rpc
 class TConfigThrift(BaseModel):
-    psm: Text = None
-    env: Text = None
-    cluster: Text = None
-    target: Text = None
-    include_dirs: List[Text] = None
+    model_config = ConfigDict(defer_build=True)
+
+    psm: Optional[str] = None
+    env: Optional[str] = None
+    cluster: Optional[str] = None
+    target: Optional[str] = None
+    include_dirs: Optional[List[str]] = None
     thrift_client: Any = None
     timeout: int = 10
-    idl_path: Text = None
-    method: Text = None
-    ip: Text = "127.0.0.1"
+    idl_path: Optional[str] = None
+    method: Optional[str] = None
+    ip: str = "127.0.0.1"
     port: int = 9000
-    service_name: Text = None
+    service_name: Optional[str] = None
     proto_type: ProtoType = ProtoType.Binary
     trans_type: TransType = TransType.Buffered
 
 
 # configs for db
 class TConfigDB(BaseModel):
-    psm: Text = None
-    user: Text = None
-    password: Text = None
-    ip: Text = None
+    model_config = ConfigDict(defer_build=True)
+
+    psm: Optional[str] = None
+    user: Optional[str] = None
+    password: Optional[str] = None
+    ip: Optional[str] = None
     port: int = 3306
-    database: Text = None
+    database: Optional[str] = None
 
 
-class TransportEnum(Text, Enum):
+class TransportEnum(str, Enum):
     BUFFERED = "buffered"
     FRAMED = "framed"
 
@@ -80,25 +100,28 @@ class TransportEnum(Text, Enum):
 class TThriftRequest(BaseModel):
     """rpc request model"""
 
-    method: Text = ""
-    params: Dict = {}
+    model_config = ConfigDict(defer_build=True)
+
+    method: str = ""
+    params: Dict = Field(default_factory=dict)
     thrift_client: Any = None
-    idl_path: Text = ""  # idl local path
+    idl_path: str = ""  # idl local path
     timeout: int = 10  # sec
     transport: TransportEnum = TransportEnum.BUFFERED
-    include_dirs: List[Union[Text, None]] = []  # param of thriftpy2.load
-    target: Text = ""  # tcp://{ip}:{port} or sd://psm?cluster=xx&env=xx
-    env: Text = "prod"
-    cluster: Text = "default"
-    psm: Text = ""
-    service_name: Text = None
-    ip: Text = None
-    port: int = None
-    proto_type: ProtoType = None
-    trans_type: TransType = None
-
-
-class SqlMethodEnum(Text, Enum):
+    # param of thriftpy2.load
+    include_dirs: List[Union[str, None]] = Field(default_factory=list)
+    target: str = ""  # tcp://{ip}:{port} or sd://psm?cluster=xx&env=xx
+    env: str = "prod"
+    cluster: str = "default"
+    psm: str = ""
+    service_name: Optional[str] = None
+    ip: Optional[str] = None
+    port: Optional[int] = None
+    proto_type: Optional[ProtoType] = None
+    trans_type: Optional[TransType] = None
+
+
+class SqlMethodEnum(str, Enum):
     FETCHONE = "FETCHONE"
     FETCHMANY = "FETCHMANY"
     FETCHALL = "FETCHALL"
@@ -110,57 +133,75 @@ class SqlMethodEnum(Text, Enum):
 class TSqlRequest(BaseModel):
     """sql request model"""
 
-    db_config: TConfigDB = TConfigDB()
-    method: SqlMethodEnum = None
-    sql: Text = None
+    model_config = ConfigDict(defer_build=True)
+
+    db_config: TConfigDB = Field(default_factory=TConfigDB)
+    method: Optional[SqlMethodEnum] = None
+    sql: Optional[str] = None
     size: int = 0  # limit nums of sql result
 
 
 class TConfig(BaseModel):
+    # numbers in yaml/json testcases are accepted as text, e.g. name: 123
+    model_config = ConfigDict(defer_build=True, coerce_numbers_to_str=True)
+
     name: Name
     verify: Verify = False
     base_url: BaseUrl = ""
-    # Text: prepare variables in debugtalk.py, ${gen_variables()}
-    variables: Union[VariablesMapping, Text] = {}
-    parameters: Union[VariablesMapping, Text] = {}
+    # str: prepare variables in debugtalk.py, ${gen_variables()}
+    variables: Union[VariablesMapping, str] = Field(default_factory=dict)
+    parameters: Union[VariablesMapping, str] = Field(default_factory=dict)
     # setup_hooks: Hooks = []
     # teardown_hooks: Hooks = []
-    export: Export = []
-    path: Text = None
+    export: Export = Field(default_factory=list)
+    path: Optional[LenientStr] = None
     # configs for other protocols
-    thrift: TConfigThrift = None
-    db: TConfigDB = TConfigDB()
+    thrift: Optional[TConfigThrift] = None
+    db: TConfigDB = Field(default_factory=TConfigDB)
 
 
 class TRequest(BaseModel):
     """requests.Request model"""
 
+    # e.g. params: {"page": 1}, headers: {"Content-Length": 0}
+    model_config = ConfigDict(
+        defer_build=True, populate_by_name=True, coerce_numbers_to_str=True
+    )
+
     method: MethodEnum
     url: Url
-    params: Dict[Text, Text] = {}
-    headers: Headers = {}
-    req_json: Union[Dict, List, Text] = Field(None, alias="json")
-    data: Union[Text, Dict[Text, Any]] = None
-    cookies: Cookies = {}
+    params: Dict[str, LenientStr] = Field(default_factory=dict)
+    headers: Headers = Field(default_factory=dict)
+    # members are exclusive, take the first match instead of trying all of them
+    req_json: Union[Dict, List, str, None] = Field(
+        None, alias="json", union_mode="left_to_right"
+    )
+    data: Union[str, Dict[str, Any], None] = Field(None, union_mode="left_to_right")
+    cookies: Cookies = Field(default_factory=dict)
     timeout: float = 120
     allow_redirects: bool = True
     verify: Verify = False
-    upload: Dict = {}  # used for upload files
+    upload: Dict = Field(default_factory=dict)  # used for upload files
 
 
 class TStep(BaseModel):
+    model_config = ConfigDict(
+        defer_build=True, populate_by_name=True, coerce_numbers_to_str=True
+    )
+
     name: Name
     request: Union[TRequest, None] = None
-    testcase: Union[Text, Callable, None] = None
-    variables: VariablesMapping = {}
-    setup_hooks: Hooks = []
-    teardown_hooks: Hooks = []
+    testcase: Union[LenientStr, Callable, None] = None
+    variables: VariablesMapping = Field(default_factory=dict)
+    setup_hooks: Hooks = Field(default_factory=list)
+    teardown_hooks: Hooks = Field(default_factory=list)
     # used to extract request's response field
-    extract: VariablesMapping = {}
+    extract: VariablesMapping = Field(default_factory=dict)
     # used to export session variables from referenced testcase
-    export: Export = []
-    validators: Validators = Field([], alias="validate")  # validators，类型Validators，别名validate，默认值是空列表
-    validate_script: List[Text] = []
+    export: Export = Field(default_factory=list)
+    # validators，类型Validators，别名validate，默认值是空列表
+    validators: Validators = Field(default_factory=list, alias="validate")
+    validate_script: List[LenientStr] = Field(default_factory=list)
     retry_times: int = 0
     retry_interval: int = 0  # sec
     thrift_request: Union[TThriftRequest, None] = None
@@ -168,6 +209,8 @@ class TStep(BaseModel):
 
 
 class TestCase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     config: TConfig
     teststeps: List[TStep]
 
@@ -176,64 +219,84 @@ class ProjectMeta(BaseModel):
     # 在Pydantic中，BaseModel是一个核心概念，用于定义数据模型和验证输入数据。
     # 通过定义数据模型并使用BaseModel进行验证，开发者可以减少手动验证代码的编写，提高代码的可维护性。
     # BaseModel的类型提示也使得代码更加清晰和易于理解
-    debugtalk_py: Text = ""  # debugtalk.py file content
-    debugtalk_path: Text = ""  # debugtalk.py file path
-    dot_env_path: Text = ""  # .env file path
-    functions: FunctionsMapping = {}  # functions defined in debugtalk.py
-    env: Env = {}
-    RootDir: Text = (
-        # 它将输出你的Python脚本当前正在运行的目录的完整路径，即当前工作目录
-        os.getcwd()
-    )  # project root directory (ensure absolute), the path debugtalk.py located
+    model_config = ConfigDict(defer_build=True)
+
+    debugtalk_py: str = ""  # debugtalk.py file content
+    debugtalk_path: str = ""  # debugtalk.py file path
+    dot_env_path: str = ""  # .env file path
+    # functions defined in debugtalk.py
+    functions: FunctionsMapping = Field(default_factory=dict)
+    env: Env = Field(default_factory=dict)
+    # project root directory (ensure absolute), the path debugtalk.py located
+    # defaults to current working directory when instantiated, not when imported
+    RootDir: str = Field(default_factory=os.getcwd)
 
 
 class TestsMapping(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     project_meta: ProjectMeta
     testcases: List[TestCase]
 
 
 class TestCaseTime(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     start_at: float = 0
-    start_at_iso_format: Text = ""
+    start_at_iso_format: str = ""
     duration: float = 0
 
 
 class TestCaseInOut(BaseModel):
-    config_vars: VariablesMapping = {}
-    export_vars: Dict = {}
+    model_config = ConfigDict(defer_build=True)
+
+    config_vars: VariablesMapping = Field(default_factory=dict)
+    export_vars: Dict = Field(default_factory=dict)
 
 
 class RequestStat(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     content_size: float = 0
     response_time_ms: float = 0
     elapsed_ms: float = 0
 
 
 class AddressData(BaseModel):
-    client_ip: Text = "N/A"
+    model_config = ConfigDict(defer_build=True)
+
+    client_ip: str = "N/A"
     client_port: int = 0
-    server_ip: Text = "N/A"
+    server_ip: str = "N/A"
     server_port: int = 0
 
 
 class RequestData(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     method: MethodEnum = MethodEnum.GET
     url: Url
-    headers: Headers = {}
-    cookies: Cookies = {}
-    body: Union[Text, bytes, List, Dict, None] = {}
+    headers: Headers = Field(default_factory=dict)
+    cookies: Cookies = Field(default_factory=dict)
+    # str, bytes, List, Dict or None, already typed when recorded from requests
+    body: Any = Field(default_factory=dict)
 
 
 class ResponseData(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     status_code: int
     headers: Dict
     cookies: Cookies
-    encoding: Union[Text, None] = None
-    content_type: Text
-    body: Union[Text, bytes, List, Dict, None]
+    encoding: Union[str, None] = None
+    content_type: str
+    # str, bytes, List, Dict or None, already typed when recorded from requests
+    body: Any
 
 
 class ReqRespData(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     request: RequestData
     response: ResponseData
 
@@ -241,29 +304,31 @@ class ReqRespData(BaseModel):
 class SessionData(BaseModel):
     """request session data, including request, response, validators and stat data"""
 
+    model_config = ConfigDict(defer_build=True)
+
     success: bool = False
     # in most cases, req_resps only contains one request & response
     # while when 30X redirect occurs, req_resps will contain multiple request & response
-    req_resps: List[ReqRespData] = []
-    stat: RequestStat = RequestStat()
-    address: AddressData = AddressData()
-    validators: Dict = {}
+    req_resps: List[ReqRespData] = Field(default_factory=list)
+    stat: RequestStat = Field(default_factory=RequestStat)
+    address: AddressData = Field(default_factory=AddressData)
+    validators: Dict = Field(default_factory=dict)
 
 
 class StepResult(BaseModel):
     """teststep data, each step maybe corresponding to one request or one testcase"""
 
-    name: Text = ""  # teststep name
-    step_type: Text = ""  # teststep type, request or testcase
+    # self-referencing schema is built on first use, with "StepResult" resolved then
+    model_config = ConfigDict(defer_build=True)
+
+    name: str = ""  # teststep name
+    step_type: str = ""  # teststep type, request or testcase
     success: bool = False
-    data: Union[SessionData, List["StepResult"]] = None
+    data: Union[SessionData, List["StepResult"], None] = None
     elapsed: float = 0.0  # teststep elapsed time
     content_size: float = 0  # response content size
-    export_vars: VariablesMapping = {}
-    attachment: Text = ""  # teststep attachment
-
-
-StepResult.update_forward_refs()
+    export_vars: VariablesMapping = Field(default_factory=dict)
+    attachment: str = ""  # teststep attachment
 
 
 # 这段代码定义了一个名为 IStep 的接口（在 Python 中通常通过定义一个包含抽象方法的类来实现接口的概念）。
@@ -288,30 +353,38 @@ class IStep(object):
 
 
 class TestCaseSummary(BaseModel):
-    name: Text
+    model_config = ConfigDict(defer_build=True)
+
+    name: str
     success: bool
-    case_id: Text
+    case_id: str
     time: TestCaseTime
-    in_out: TestCaseInOut = {}
-    log: Text = ""
-    step_results: List[StepResult] = []
+    in_out: TestCaseInOut = Field(default_factory=TestCaseInOut)
+    log: str = ""
+    step_results: List[StepResult] = Field(default_factory=list)
 
 
 class PlatformInfo(BaseModel):
-    httprunner_version: Text
-    python_version: Text
-    platform: Text
+    model_config = ConfigDict(defer_build=True)
+
+    httprunner_version: str
+    python_version: str
+    platform: str
 
 
 class Stat(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     total: int = 0
     success: int = 0
     fail: int = 0
 
 
 class TestSuiteSummary(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     success: bool = False
-    stat: Stat = Stat()
-    time: TestCaseTime = TestCaseTime()
+    stat: Stat = Field(default_factory=Stat)
+    time: TestCaseTime = Field(default_factory=TestCaseTime)
     platform: PlatformInfo
     testcases: List[TestCaseSummary]
@@ -1,8 +1,11 @@
 import ast
 import builtins
+import collections
+import functools
 import os
 import re
-from typing import Any, Callable, Dict, List, Set, Text
+import types
+from typing import Any, Callable, Dict, Iterator, List, Set, Text, Tuple, Union
 from urllib.parse import urlparse
 
 from loguru import logger
@@ -10,14 +13,33 @@ from loguru import logger
 from httprunner import exceptions, loader, utils
 from httprunner.models import FunctionsMapping, VariablesMapping
 
-# use $$ to escape $ notation
-dolloar_regex_compile = re.compile(r"\$\$")
-# variable notation, e.g. ${var} or $var
-# variable should start with a-zA-Z_
-variable_regex_compile = re.compile(r"\$\{([a-zA-Z_]\w*)\}|\$([a-zA-Z_]\w*)")
 # function notation, e.g. ${func1($var_1, $var_3)}
 # 两个捕获组，group[0]是([a-zA-Z_]\w*)，group[1]是([\$\w\.\-/\s=,]*)
 function_regex_compile = re.compile(r"\$\{([a-zA-Z_]\w*)\(([\$\w\.\-/\s=,]*)\)\}")
+# use $$ to escape $ notation, variable notation, e.g. ${var} or $var,
+# variable should start with a-zA-Z_, matched in one pass
+dollar_variable_regex_compile = re.compile(
+    r"\$\$|\$\{([a-zA-Z_]\w*)\}|\$([a-zA-Z_]\w*)"
+)
+# $$, function or variable notation, matched in one pass
+template_regex_compile = re.compile(
+    r"\$\$"
+    r"|\$\{([a-zA-Z_]\w*)\(([\$\w\.\-/\s=,]*)\)\}"
+    r"|\$\{([a-zA-Z_]\w*)\}|\$([a-zA-Z_]\w*)"
+)
+# functions of httprunner.builtin with aliases, see _get_builtin_functions
+builtin_functions_mapping: Union[FunctionsMapping, None] = None
+# op types of compiled templates
+LITERAL_OP = "literal"
+VARIABLE_OP = "variable"
+FUNCTION_OP = "function"
+# parsed results are memoized for templates referencing only these value types,
+# floats are excluded since equal keys may differ in text, e.g. 0.0 == -0.0
+MEMOIZABLE_VALUE_TYPES = frozenset([str, int, bool, type(None)])
+# memo keys hold referenced values, longer strings are not memoized to bound memory
+MEMOIZABLE_STR_MAX_LENGTH = 256
+# shared read-only default for missing variables/functions mapping
+EMPTY_MAPPING = types.MappingProxyType({})
 
 
 def parse_string_value(str_value: Text) -> Any:
@@ -27,6 +49,11 @@ def parse_string_value(str_value: Text) -> Any:
          "abc" => "abc"
          "$var" => "$var"
     """
+    if isinstance(str_value, str) and str_value.startswith("$"):
+        # variable or function reference can not be a python literal,
+        # return directly instead of raising and catching SyntaxError
+        return str_value
+
     try:
         # 不执行任何代码，安全的解析评估变量是否是python字面量，如数字、字符串、元组、列表、字典、布尔值、None 等
         return ast.literal_eval(str_value)
@@ -37,8 +64,23 @@ def parse_string_value(str_value: Text) -> Any:
         return str_value
 
 
+@functools.lru_cache(maxsize=32)
+def _get_base_url_prefix(base_url: Text) -> Text:
+    """get scheme, netloc and path of base url, the same base url is used by all steps"""
+    o_base_url = urlparse(base_url)
+    if o_base_url.netloc == "":
+        # missed base url
+        raise exceptions.ParamsError("base url missed!")
+
+    return f"{o_base_url.scheme}://{o_base_url.netloc}{o_base_url.path.rstrip('/')}"
+
+
 def build_url(base_url, step_url):
     """prepend url with base_url unless it's already an absolute URL"""
+    if step_url.startswith("/") and not step_url.startswith("//"):
+        # step url is relative path, no need to parse it
+        return _get_base_url_prefix(base_url) + "/" + step_url.lstrip("/")
+
     o_step_url = urlparse(step_url)
     if o_step_url.netloc != "":
         # step url is absolute url
@@ -82,46 +124,18 @@ def regex_findall_variables(raw_string: Text) -> List[Text]:
         []
 
     """
-    try:
-        # 从开始的位置找到第一个$,返回索引
-        match_start_position = raw_string.index("$", 0)
-    except ValueError:
+    if "$" not in raw_string:
         return []
 
-    vars_list = []
-    while match_start_position < len(raw_string):
-
-        # Notice: notation priority
-        # $$ > $var
-
-        # search $$，$$value就不算，如果想要算这段代码就可以只是掉
-        # match只从指定的开始位置寻找是否匹配，开始位置没有则返回none
-        dollar_match = dolloar_regex_compile.match(raw_string, match_start_position)
-        if dollar_match:
-            match_start_position = dollar_match.end()
-            continue
-
-        # search variable like ${var} or $var
-        var_match = variable_regex_compile.match(raw_string, match_start_position)
-        if var_match:
-            # "\$\{([a-zA-Z_]\w*)\}|\$([a-zA-Z_]\w*)"里两个（）就是两个匹配组，第一组是${var1},第二组是$var2
-            # var_match.group(1)}=var1,var_match.group(2)=var2,同时肯定只符合一个，另一个是none
-            var_name = var_match.group(1) or var_match.group(2)
-            vars_list.append(var_name)
-            # print(f'匹配分组1:{var_match.group(1)}')
-            # print(f'匹配分组2:{var_match.group(2)}')
-            match_start_position = var_match.end()
-            continue
-
-        curr_position = match_start_position
-        try:
-            # find next $ location
-            match_start_position = raw_string.index("$", curr_position + 1)
-        except ValueError:
-            # break while loop
-            break
-
-    return vars_list
+    # Notice: notation priority
+    # $$ > $var, $$ matches with both groups empty, e.g. $$value is not a variable
+    return [
+        braced_var_name or var_name
+        for braced_var_name, var_name in dollar_variable_regex_compile.findall(
+            raw_string
+        )
+        if braced_var_name or var_name
+    ]
 
 
 def regex_findall_functions(content: Text) -> List[Text]:
@@ -157,22 +171,56 @@ def regex_findall_functions(content: Text) -> List[Text]:
         return []
 
 
+def _extract_str_variables(content: Text) -> Set:
+    if "$" not in content:
+        return set()
+
+    return {
+        braced_var_name or var_name
+        for braced_var_name, var_name in dollar_variable_regex_compile.findall(content)
+        if braced_var_name or var_name
+    }
+
+
+def _extract_list_variables(content: Union[List, Set, Tuple]) -> Set:
+    variables = set()
+    for item in content:
+        variables.update(extract_variables(item))
+    return variables
+
+
+def _extract_dict_variables(content: Dict) -> Set:
+    variables = set()
+    for key, value in content.items():
+        # dict keys are parsed as well, e.g. {"$key": 1}
+        variables.update(extract_variables(key))
+        variables.update(extract_variables(value))
+    return variables
+
+
+# extract_variables handlers dispatched by exact type, the same as parse_data
+_extract_variables_handlers = {
+    str: _extract_str_variables,
+    list: _extract_list_variables,
+    set: _extract_list_variables,
+    tuple: _extract_list_variables,
+    dict: _extract_dict_variables,
+}
+
+
 def extract_variables(content: Any) -> Set:
     """extract all variables in content recursively."""
-    if isinstance(content, (list, set, tuple)):
-        variables = set()
-        for item in content:
-            variables = variables | extract_variables(item)
-        return variables
+    handler = _extract_variables_handlers.get(type(content))
+    if handler is not None:
+        return handler(content)
 
+    # subclasses of builtin types, e.g. OrderedDict
+    if isinstance(content, (list, set, tuple)):
+        return _extract_list_variables(content)
     elif isinstance(content, dict):
-        variables = set()
-        for key, value in content.items():
-            variables = variables | extract_variables(value)
-        return variables
-
+        return _extract_dict_variables(content)
     elif isinstance(content, str):
-        return set(regex_findall_variables(content))
+        return _extract_str_variables(content)
 
     return set()
 
@@ -219,7 +267,8 @@ def parse_function_params(params: Text) -> Dict:
     for arg in args_list:
         arg = arg.strip()
         if "=" in arg:
-            key, value = arg.split("=")
+            # only split on the first "=", value may contain "=", e.g. a=b=c
+            key, value = arg.split("=", 1)
             function_meta["kwargs"][key.strip()] = parse_string_value(value.strip())
         else:
             function_meta["args"].append(parse_string_value(arg))
@@ -252,6 +301,19 @@ def get_mapping_variable(
         )
 
 
+def _get_builtin_functions() -> Dict[Text, Callable]:
+    """get functions provided by HttpRunner, loaded once on first lookup"""
+    global builtin_functions_mapping
+    if builtin_functions_mapping is None:
+        # 返回httprunner.builtin包下的所有模块的函数，这里是comparators,functions
+        functions = loader.load_builtin_functions()
+        functions["parameterize"] = functions["P"] = loader.load_csv_file
+        functions["environ"] = functions["ENV"] = utils.get_os_environ
+        builtin_functions_mapping = functions
+
+    return builtin_functions_mapping
+
+
 def get_mapping_function(
     function_name: Text, functions_mapping: FunctionsMapping
 ) -> Callable:
@@ -273,31 +335,20 @@ def get_mapping_function(
         # callable类型
         return functions_mapping[function_name]
 
-    elif function_name in ["parameterize", "P"]:
-        # callable类型
-        return loader.load_csv_file
-
-    elif function_name in ["environ", "ENV"]:
-        # callable类型
-        return utils.get_os_environ
+    # check if HttpRunner builtin functions, including parameterize/P and environ/ENV
+    builtin_functions = _get_builtin_functions()
+    if function_name in builtin_functions:
+        return builtin_functions[function_name]
 
     elif function_name in ["multipart_encoder", "multipart_content_type"]:
         # extension for upload test
         from httprunner.ext import uploader
+
         # getattr是从uploader对象里获取function_name属性或者方法，然后返回一个函数引用或者属性引用，是一种动态调用方法
         # 比如，uploader里定义了def upload_to_s3(file_path)，upload_function = getattr(uploader, 'upload_to_s3')
         # 调用函数，upload_function('/path/to/your/file.txt')
         return getattr(uploader, function_name)
 
-    try:
-        # check if HttpRunner builtin functions
-        # 返回httprunner.builtin包下的所有模块的函数，这里是comparators,functions
-        # 感觉这里是不是也可以直接使用上面uploader的方式
-        built_in_functions = loader.load_builtin_functions()
-        return built_in_functions[function_name]
-    except KeyError:
-        pass
-
     try:
         # check if Python builtin functions
         return getattr(builtins, function_name)
@@ -307,6 +358,121 @@ def get_mapping_function(
     raise exceptions.FunctionNotFound(f"{function_name} is not found.")
 
 
+@functools.lru_cache(maxsize=4096)
+def _compile_template(raw_string: Text) -> Tuple[Tuple, ...]:
+    """compile template into ops once, evaluated by _parse_string each time.
+
+    Examples:
+        >>> _compile_template("abc${add_one($num)}$$/$var")
+        (
+            ("literal", "abc"),
+            ("function", "add_one", ("$num",), ()),
+            ("literal", "$/"),
+            ("variable", "var"),
+        )
+
+    """
+    ops = []
+    literal_parts = []
+    last_end = 0
+
+    # Notice: notation priority
+    # $$ > ${func($a, $b)} > ${var} > $var
+    for matched in template_regex_compile.finditer(raw_string):
+        match_start, match_end = matched.span()
+        literal_parts.append(raw_string[last_end:match_start])
+        last_end = match_end
+
+        func_name, func_params_str, braced_var_name, var_name = matched.groups()
+        if func_name is None and braced_var_name is None and var_name is None:
+            # escaped $$
+            literal_parts.append("$")
+            continue
+
+        literal = "".join(literal_parts)
+        if literal:
+            ops.append((LITERAL_OP, literal))
+        literal_parts = []
+
+        if func_name is not None:
+            # 把参数整理分类成列表args和字典kwargs两种, parsed once for each template
+            function_meta = parse_function_params(func_params_str)
+            ops.append(
+                (
+                    FUNCTION_OP,
+                    func_name,
+                    tuple(function_meta["args"]),
+                    tuple(function_meta["kwargs"].items()),
+                )
+            )
+        else:
+            ops.append((VARIABLE_OP, braced_var_name or var_name))
+
+    literal_parts.append(raw_string[last_end:])
+    literal = "".join(literal_parts)
+    if literal or not ops:
+        ops.append((LITERAL_OP, literal))
+
+    return tuple(ops)
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_template_variables(raw_string: Text) -> Union[Tuple[Text, ...], None]:
+    """get variable names referenced in template, None if template calls functions,
+    whose results can not be reused, or is a single variable, e.g. $var, which is
+    substituted faster than looked up in memo.
+    """
+    ops = _compile_template(raw_string)
+    if len(ops) == 1:
+        return None
+
+    var_names = []
+    for op in ops:
+        if op[0] == FUNCTION_OP:
+            return None
+        elif op[0] == VARIABLE_OP:
+            var_names.append(op[1])
+
+    return tuple(var_names)
+
+
+def _get_typed_values(
+    var_names: Tuple[Text, ...], variables_mapping: VariablesMapping
+) -> Union[Tuple, None]:
+    """get referenced variable values as memo key, None if any value is missing,
+    not an immutable scalar or a long string. value type is part of the key,
+    in case of 1 == True
+    """
+    typed_values = []
+    for var_name in var_names:
+        try:
+            value = variables_mapping[var_name]
+        except KeyError:
+            # missing variable is reported by the uncached path
+            return None
+
+        value_type = type(value)
+        if value_type not in MEMOIZABLE_VALUE_TYPES:
+            return None
+        if value_type is str and len(value) > MEMOIZABLE_STR_MAX_LENGTH:
+            return None
+
+        typed_values.append((value_type, value))
+
+    return tuple(typed_values)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_string_memoized(
+    raw_string: Text, var_names: Tuple[Text, ...], typed_values: Tuple
+) -> Any:
+    """parse template which only references variables, memoized by variable values"""
+    variables_mapping = {
+        var_name: value for var_name, (_, value) in zip(var_names, typed_values)
+    }
+    return _parse_string(raw_string, variables_mapping, {})
+
+
 def parse_string(
     raw_string: Text,
     variables_mapping: VariablesMapping,
@@ -330,99 +496,126 @@ def parse_string(
             "abc4def"
 
     """
+    if "$" not in raw_string:
+        return raw_string
+
+    var_names = _get_template_variables(raw_string)
+    if var_names is not None:
+        typed_values = _get_typed_values(var_names, variables_mapping)
+        if typed_values is not None:
+            return _parse_string_memoized(raw_string, var_names, typed_values)
+
+    return _parse_string(raw_string, variables_mapping, functions_mapping)
+
+
+def _eval_op(
+    op: Tuple, variables_mapping: VariablesMapping, functions_mapping: FunctionsMapping
+) -> Any:
+    op_type = op[0]
+    if op_type == LITERAL_OP:
+        return op[1]
+
+    elif op_type == VARIABLE_OP:
+        # 替换变量
+        # 目前只是直接匹配variables_mapping的变量，不包含debugtalk和env里的变量，不存在则报错
+        return get_mapping_variable(op[1], variables_mapping)
+
+    # 替换可调用函数变量
+    _, func_name, args, kwargs_items = op
+    # 返回一个可调用的函数或者属性，callable类型，除了debugtalk里的还有csv，httprunner.builtin,python builtins里的函数
+    func = get_mapping_function(func_name, functions_mapping)
+    # 进一步解析函数参数里的变量, args and kwargs are parsed from template only once,
+    # parse each item directly instead of rebuilding the containers for parse_data
+    parsed_args = [
+        parse_data(arg, variables_mapping, functions_mapping) for arg in args
+    ]
+    parsed_kwargs = {
+        parse_data(key, variables_mapping, functions_mapping): parse_data(
+            value, variables_mapping, functions_mapping
+        )
+        for key, value in kwargs_items
+    }
+
     try:
-        # 从字符串索引0开始查找$，返回第一次出现的位置
-        match_start_position = raw_string.index("$", 0)
-        # 不包含match_start_position
-        parsed_string = raw_string[0:match_start_position]
-    except ValueError:
-        # 没出现$,则直接返回
-        parsed_string = raw_string
-        return parsed_string
+        # 调用函数
+        return func(*parsed_args, **parsed_kwargs)
+    except Exception as ex:
+        logger.error(
+            f"call function error:\n"
+            f"func_name: {func_name}\n"
+            f"args: {parsed_args}\n"
+            f"kwargs: {parsed_kwargs}\n"
+            f"{type(ex).__name__}: {ex}"
+        )
+        raise
 
-    while match_start_position < len(raw_string):
 
-        # Notice: notation priority
-        # $$ > ${func($a, $b)} > $var
+def _parse_string(
+    raw_string: Text,
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> Any:
+    ops = _compile_template(raw_string)
+    if len(ops) == 1:
+        # raw_string is a function or variable, e.g. "${add_one(3)}" or "$var",
+        # return its value directly
+        return _eval_op(ops[0], variables_mapping, functions_mapping)
+
+    # raw_string contains one or many functions/variables, e.g. "abc${add_one(3)}def"
+    return "".join(
+        [str(_eval_op(op, variables_mapping, functions_mapping)) for op in ops]
+    )
 
-        # search $$
-        dollar_match = dolloar_regex_compile.match(raw_string, match_start_position)
-        if dollar_match:
-            match_start_position = dollar_match.end()
-            parsed_string += "$"
-            continue
 
-        # 替换可调用函数变量
-        # search function like ${func($a, $b)}
-        func_match = function_regex_compile.match(raw_string, match_start_position)
-        if func_match:
-            func_name = func_match.group(1)
-            # 返回一个可调用的函数或者属性，callable类型，除了debugtalk里的还有csv，httprunner.builtin,python builtins里的函数
-            func = get_mapping_function(func_name, functions_mapping)
-            # 可调用函数参数
-            func_params_str = func_match.group(2)
-            # 把参数整理分类成列表args和字典kwargs两种
-            function_meta = parse_function_params(func_params_str)
-            args = function_meta["args"]
-            kwargs = function_meta["kwargs"]
-            # 进一步解析函数参数里的变量
-            parsed_args = parse_data(args, variables_mapping, functions_mapping)
-            parsed_kwargs = parse_data(kwargs, variables_mapping, functions_mapping)
-
-            try:
-                # 调用函数
-                func_eval_value = func(*parsed_args, **parsed_kwargs)
-            except Exception as ex:
-                logger.error(
-                    f"call function error:\n"
-                    f"func_name: {func_name}\n"
-                    f"args: {parsed_args}\n"
-                    f"kwargs: {parsed_kwargs}\n"
-                    f"{type(ex).__name__}: {ex}"
-                )
-                raise
+def _parse_str_data(
+    raw_data: Text,
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> Any:
+    # only strip whitespaces and tabs, \n\r is left because they maybe used in changeset
+    raw_data = raw_data.strip(" \t")
+    if "$" not in raw_data:
+        # plain string, most values in teststeps are not templated
+        return raw_data
 
-            func_raw_str = "${" + func_name + f"({func_params_str})" + "}"
-            if func_raw_str == raw_string:
-                # raw_string is a function, e.g. "${add_one(3)}", return its eval value directly
-                return func_eval_value
+    # content in string format may contains variables and functions
+    # share one read-only empty mapping instead of allocating new dicts
+    if variables_mapping is None:
+        variables_mapping = EMPTY_MAPPING
+    if functions_mapping is None:
+        functions_mapping = EMPTY_MAPPING
+    return parse_string(raw_data, variables_mapping, functions_mapping)
 
-            # raw_string contains one or many functions, e.g. "abc${add_one(3)}def"
-            parsed_string += str(func_eval_value)
-            match_start_position = func_match.end()
-            continue
 
+def _parse_list_data(
+    raw_data: Union[List, Set, Tuple],
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> List:
+    return [parse_data(item, variables_mapping, functions_mapping) for item in raw_data]
 
-        # 替换变量
-        # search variable like ${var} or $var
-        var_match = variable_regex_compile.match(raw_string, match_start_position)
-        if var_match:
-            var_name = var_match.group(1) or var_match.group(2)
-            # 目前只是直接匹配variables_mapping的变量，不包含debugtalk和env里的变量，不存在则报错
-            var_value = get_mapping_variable(var_name, variables_mapping)
-
-            if f"${var_name}" == raw_string or "${" + var_name + "}" == raw_string:
-                # raw_string is a variable, $var or ${var}, return its value directly
-                return var_value
-
-            # raw_string contains one or many variables, e.g. "abc${var}def"
-            parsed_string += str(var_value)
-            match_start_position = var_match.end()
-            continue
 
-        curr_position = match_start_position
-        try:
-            # find next $ location
-            match_start_position = raw_string.index("$", curr_position + 1)
-            remain_string = raw_string[curr_position:match_start_position]
-        except ValueError:
-            remain_string = raw_string[curr_position:]
-            # break while loop
-            match_start_position = len(raw_string)
+def _parse_dict_data(
+    raw_data: Dict,
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping,
+) -> Dict:
+    return {
+        parse_data(key, variables_mapping, functions_mapping): parse_data(
+            value, variables_mapping, functions_mapping
+        )
+        for key, value in raw_data.items()
+    }
 
-        parsed_string += remain_string
 
-    return parsed_string
+# parse_data handlers dispatched by exact type, avoid isinstance checks for each node
+_parse_data_handlers = {
+    str: _parse_str_data,
+    list: _parse_list_data,
+    set: _parse_list_data,
+    tuple: _parse_list_data,
+    dict: _parse_dict_data,
+}
 
 
 def parse_data(
@@ -433,80 +626,107 @@ def parse_data(
     """parse raw data with evaluated variables mapping.
     Notice: variables_mapping should not contain any variable or function.
     """
-    if isinstance(raw_data, str):
-        # content in string format may contains variables and functions
-        variables_mapping = variables_mapping or {}
-        functions_mapping = functions_mapping or {}
-        # only strip whitespaces and tabs, \n\r is left because they maybe used in changeset
-        raw_data = raw_data.strip(" \t")
-        return parse_string(raw_data, variables_mapping, functions_mapping)
+    handler = _parse_data_handlers.get(type(raw_data))
+    if handler is not None:
+        return handler(raw_data, variables_mapping, functions_mapping)
 
+    # subclasses of builtin types, e.g. OrderedDict
+    if isinstance(raw_data, str):
+        return _parse_str_data(raw_data, variables_mapping, functions_mapping)
     elif isinstance(raw_data, (list, set, tuple)):
-        return [
-            parse_data(item, variables_mapping, functions_mapping) for item in raw_data
-        ]
-
+        return _parse_list_data(raw_data, variables_mapping, functions_mapping)
     elif isinstance(raw_data, dict):
-        parsed_data = {}
-        for key, value in raw_data.items():
-            parsed_key = parse_data(key, variables_mapping, functions_mapping)
-            parsed_value = parse_data(value, variables_mapping, functions_mapping)
-            parsed_data[parsed_key] = parsed_value
+        return _parse_dict_data(raw_data, variables_mapping, functions_mapping)
 
-        return parsed_data
-
-    else:
-        # other types, e.g. None, int, float, bool
-        return raw_data
+    # other types, e.g. None, int, float, bool
+    return raw_data
 
 
 def parse_variables_mapping(
-    variables_mapping: VariablesMapping, functions_mapping: FunctionsMapping = None
+    variables_mapping: VariablesMapping,
+    functions_mapping: FunctionsMapping = None,
+    parsed_variables: VariablesMapping = None,
 ) -> VariablesMapping:
+    """parse variables mapping in dependency order.
 
-    parsed_variables: VariablesMapping = {}
-
-    # 判断解析过的变量和要解析的变量长度是否一致，解决了$foo1里调用$foo2,但是遍历是按照顺序的，解析foo1的时候还没解析foo2的问题
-    # 但是如果是互相调用，就会进入死循环，这里应该加一个循环限制
-    while len(parsed_variables) != len(variables_mapping):
-        for var_name in variables_mapping:
-
-            # 如果已经解析过则跳过
-            if var_name in parsed_variables:
-                continue
-
-            var_value = variables_mapping[var_name]
-            # 提取变量值里使用的变量$value/${value}
-            variables = extract_variables(var_value)
-
-            # check if reference variable itself
-            # 如果变量值里调用的变量是当前遍历的变量key自己，抛出异常
-            if var_name in variables:
-                # e.g.
-                # variables_mapping = {"token": "abc$token"}
-                # variables_mapping = {"key": ["$key", 2]}
-                # 抛出异常，方法又没有向上抛出异常，走到这里会异常中断
-                raise exceptions.VariableNotFound(var_name)
-
-            # check if reference variable not in variables_mapping
-            # 列表推导式，在变量值里提取的变量如果不在变量列表里，抛出异常
-            not_defined_variables = [
-                v_name for v_name in variables if v_name not in variables_mapping
-            ]
-            if not_defined_variables:
-                # e.g. {"varA": "123$varB", "varB": "456$varC"}
-                # e.g. {"varC": "${sum_two($a, $b)}"}
-                raise exceptions.VariableNotFound(not_defined_variables)
-
-            try:
-                parsed_value = parse_data(
-                    var_value, parsed_variables, functions_mapping
-                )
-            except exceptions.VariableNotFound:
-                # 捕捉到可替换的变量里不存在，跳过当前循环
-                continue
+    Args:
+        variables_mapping: variables to be parsed, may reference each other.
+        functions_mapping: functions mapping.
+        parsed_variables: variables which have been parsed already, they can be
+            referenced by variables_mapping and are returned as they are.
+
+    """
+    # variables in variables_mapping override parsed variables with the same name
+    parsed_variables = {
+        var_name: var_value
+        for var_name, var_value in (parsed_variables or {}).items()
+        if var_name not in variables_mapping
+    }
+
+    # dependency graph, variable name => variables referenced in its value
+    dependencies: Dict[Text, Set] = {}
+    for var_name, var_value in variables_mapping.items():
+        # 提取变量值里使用的变量$value/${value}
+        variables = extract_variables(var_value)
+
+        # check if reference variable itself
+        # 如果变量值里调用的变量是当前遍历的变量key自己，抛出异常
+        if var_name in variables:
+            # e.g.
+            # variables_mapping = {"token": "abc$token"}
+            # variables_mapping = {"key": ["$key", 2]}
+            raise exceptions.VariableNotFound(var_name)
+
+        # check if reference variable not in variables_mapping
+        # 列表推导式，在变量值里提取的变量如果不在变量列表里，抛出异常
+        not_defined_variables = [
+            v_name
+            for v_name in variables
+            if v_name not in variables_mapping and v_name not in parsed_variables
+        ]
+        if not_defined_variables:
+            # e.g. {"varA": "123$varB", "varB": "456$varC"}
+            # e.g. {"varC": "${sum_two($a, $b)}"}
+            raise exceptions.VariableNotFound(not_defined_variables)
+
+        # parsed variables are available already, not dependencies to be waited for
+        dependencies[var_name] = {
+            v_name for v_name in variables if v_name in variables_mapping
+        }
+
+    # parse variables in topological order (Kahn's algorithm), thus $foo1 referencing
+    # $foo2 is parsed after $foo2, whatever the order they are defined in
+    in_degree = {var_name: len(deps) for var_name, deps in dependencies.items()}
+    dependents: Dict[Text, List[Text]] = {var_name: [] for var_name in dependencies}
+    for var_name, deps in dependencies.items():
+        for dep_name in deps:
+            dependents[dep_name].append(var_name)
 
-            parsed_variables[var_name] = parsed_value
+    ready = collections.deque(
+        var_name for var_name, degree in in_degree.items() if degree == 0
+    )
+    while ready:
+        var_name = ready.popleft()
+        parsed_variables[var_name] = parse_data(
+            variables_mapping[var_name], parsed_variables, functions_mapping
+        )
+        for dependent in dependents[var_name]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                ready.append(dependent)
+
+    # 变量之间互相调用，e.g. {"varA": "$varB", "varB": "$varA"}
+    circular_variables = [
+        var_name for var_name, degree in in_degree.items() if degree > 0
+    ]
+    if circular_variables:
+        raise exceptions.VariableNotFound(
+            f"circular reference in variables: {circular_variables}"
+        )
+
+    # keep the order variables are defined in, after the parsed variables
+    for var_name in variables_mapping:
+        parsed_variables[var_name] = parsed_variables.pop(var_name)
 
     return parsed_variables
 
@@ -514,7 +734,23 @@ def parse_variables_mapping(
 def parse_parameters(
     parameters: Dict,
 ) -> List[Dict]:
-    """parse parameters and generate cartesian product.
+    """parse parameters and generate cartesian product list.
+
+    Args:
+        parameters (Dict) parameters: parameter name and value mapping, see iter_parameters
+
+    Returns:
+        list: cartesian product list
+
+    """
+    return list(iter_parameters(parameters))
+
+
+def iter_parameters(
+    parameters: Dict,
+) -> Iterator[Dict]:
+    """parse parameters and generate cartesian product one by one.
+    parameters are parsed at once, only the cartesian product is generated lazily.
 
     Args:
         parameters (Dict) parameters: parameter name and value mapping
@@ -524,7 +760,7 @@ def parse_parameters(
                 (3) call custom function in debugtalk.py, "${gen_app_version()}"
 
     Returns:
-        list: cartesian product list
+        iterator: cartesian product iterator
 
     Examples:
         >>> parameters = {
@@ -532,13 +768,14 @@ def parse_parameters(
             "username-password": "${parameterize(account.csv)}",
             "app_version": "${gen_app_version()}",
         }
-        >>> parse_parameters(parameters)
+        >>> list(iter_parameters(parameters))
 
     """
     parsed_parameters_list: List[List[Dict]] = []
 
-    # load project_meta functions
-    project_meta = loader.load_project_meta(os.getcwd())
+    # load project_meta functions, use the most recently loaded project if any,
+    # which is also the base directory of relative csv file paths
+    project_meta = loader.project_meta or loader.load_project_meta(os.getcwd())
     functions_mapping = project_meta.functions
 
     for parameter_name, parameter_content in parameters.items():
@@ -617,7 +854,7 @@ def parse_parameters(
 
         parsed_parameters_list.append(parameter_content_list)
 
-    return utils.gen_cartesian_product(*parsed_parameters_list)
+    return utils.iter_cartesian_product(*parsed_parameters_list)
 
 
 class Parser(object):
@@ -629,8 +866,14 @@ class Parser(object):
     ) -> Any:
         return parse_string(raw_string, variables_mapping, self.functions_mapping)
 
-    def parse_variables(self, variables_mapping: VariablesMapping) -> VariablesMapping:
-        return parse_variables_mapping(variables_mapping, self.functions_mapping)
+    def parse_variables(
+        self,
+        variables_mapping: VariablesMapping,
+        parsed_variables: VariablesMapping = None,
+    ) -> VariablesMapping:
+        return parse_variables_mapping(
+            variables_mapping, self.functions_mapping, parsed_variables
+        )
 
     def parse_data(
         self, raw_data: Any, variables_mapping: VariablesMapping = None
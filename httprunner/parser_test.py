@@ -1,9 +1,10 @@
 import os
 import time
 import unittest
+from collections import OrderedDict
 
 from httprunner import parser
-from httprunner.exceptions import FunctionNotFound, VariableNotFound
+from httprunner.exceptions import FunctionNotFound, ParamsError, VariableNotFound
 from httprunner.loader import load_project_meta
 
 
@@ -32,6 +33,9 @@ class TestParserBasic(unittest.TestCase):
         url = parser.build_url("https://postman-echo.com", "https://httpbin.org/get")
         self.assertEqual(url, "https://httpbin.org/get")
 
+        with self.assertRaises(ParamsError):
+            parser.build_url("", "/get")
+
     def test_parse_variables_mapping(self):
         variables = {"varA": "$varB", "varB": "$varC", "varC": "123", "a": 1, "b": 2}
         parsed_variables = parser.parse_variables_mapping(variables)
@@ -44,6 +48,31 @@ class TestParserBasic(unittest.TestCase):
         with self.assertRaises(VariableNotFound):
             parser.parse_variables_mapping(variables)
 
+    def test_parse_variables_mapping_with_parsed_variables(self):
+        variables = {"varA": "$varB", "varB": "$varC/$$varD", "varE": 1}
+        parsed_variables = {"varC": "123", "varD": "$abc", "varE": 2}
+        self.assertEqual(
+            parser.parse_variables_mapping(variables, {}, parsed_variables),
+            {
+                "varC": "123",
+                "varD": "$abc",
+                "varA": "123/$varD",
+                "varB": "123/$varD",
+                "varE": 1,
+            },
+        )
+
+    def test_parse_variables_mapping_dict_key_reference(self):
+        variables = {"a": {"$k": 1}, "k": "x"}
+        self.assertEqual(
+            parser.parse_variables_mapping(variables), {"k": "x", "a": {"x": 1}}
+        )
+
+    def test_parse_variables_mapping_circular_reference(self):
+        variables = {"varA": "$varB", "varB": "${sum_two(1, $varA)}", "a": 1}
+        with self.assertRaises(VariableNotFound):
+            parser.parse_variables_mapping(variables)
+
     def test_parse_string_value(self):
         self.assertEqual(parser.parse_string_value("123"), 123)
         self.assertEqual(parser.parse_string_value("12.3"), 12.3)
@@ -117,6 +146,10 @@ class TestParserBasic(unittest.TestCase):
             parser.parse_function_params("$request, 12 3"),
             {"args": ["$request", "12 3"], "kwargs": {}},
         )
+        self.assertEqual(
+            parser.parse_function_params("url=/get?a=1, b=$b"),
+            {"args": [], "kwargs": {"url": "/get?a=1", "b": "$b"}},
+        )
 
     def test_extract_functions(self):
         self.assertEqual(parser.regex_findall_functions("${func()}"), [("func", "")])
@@ -256,6 +289,56 @@ class TestParserBasic(unittest.TestCase):
             "/users/100/1000/1498?userId=1000&data=1498",
         )
 
+    def test_parse_data_builtin_subclasses(self):
+        variables_mapping = {"var": "abc"}
+        self.assertEqual(
+            parser.parse_data(OrderedDict([("a", "$var")]), variables_mapping),
+            {"a": "abc"},
+        )
+        self.assertEqual(
+            parser.extract_variables(OrderedDict([("a", ["$var"])])), {"var"}
+        )
+
+    def test_parse_data_memoized_variables(self):
+        # memoized by value and type of referenced variables
+        self.assertEqual(parser.parse_data("$a/$b", {"a": 1, "b": 2}), "1/2")
+        self.assertEqual(parser.parse_data("$a/$b", {"a": True, "b": 2}), "True/2")
+        self.assertEqual(parser.parse_data("$a/$b", {"a": 1.0, "b": 2}), "1.0/2")
+        self.assertEqual(parser.parse_data("$a/$b", {"a": "x", "b": 2}), "x/2")
+        self.assertEqual(parser.parse_data("$var", {"var": 1}), 1)
+        self.assertIs(parser.parse_data("$var", {"var": True}), True)
+
+        # floats are not memoized, 0.0 == -0.0 but they differ in text
+        self.assertEqual(parser.parse_data("/$v", {"v": 0.0}), "/0.0")
+        self.assertEqual(parser.parse_data("/$v", {"v": -0.0}), "/-0.0")
+        self.assertEqual(parser.parse_data("$v/$b", {"v": 0.0, "b": 1}), "0.0/1")
+        self.assertEqual(parser.parse_data("$v/$b", {"v": -0.0, "b": 1}), "-0.0/1")
+
+        # single variable templates and long strings are not memoized
+        cache_size = parser._parse_string_memoized.cache_info().currsize
+        self.assertEqual(parser.parse_data("$single", {"single": "abc"}), "abc")
+        long_value = "x" * (parser.MEMOIZABLE_STR_MAX_LENGTH + 1)
+        self.assertEqual(
+            parser.parse_data("$long/$b", {"long": long_value, "b": 1}),
+            f"{long_value}/1",
+        )
+        self.assertEqual(
+            parser._parse_string_memoized.cache_info().currsize, cache_size
+        )
+
+        # mutable values are not memoized
+        value = [1, 2]
+        self.assertIs(parser.parse_data("$var", {"var": value}), value)
+
+        # functions results are not memoized
+        counter = iter(range(3))
+        functions_mapping = {"next_value": lambda: next(counter)}
+        self.assertEqual(parser.parse_data("${next_value()}", {}, functions_mapping), 0)
+        self.assertEqual(parser.parse_data("${next_value()}", {}, functions_mapping), 1)
+
+        with self.assertRaises(VariableNotFound):
+            parser.parse_data("/$var", {})
+
     def test_parse_data_string_with_functions(self):
         import random
         import string
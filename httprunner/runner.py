@@ -27,7 +27,7 @@ from httprunner.models import (
     VariablesMapping,
 )
 from httprunner.parser import Parser
-from httprunner.utils import LOGGER_FORMAT, merge_variables, ga4_client
+from httprunner.utils import LOGGER_FORMAT, ga4_client, is_self_referenced_variable
 
 
 class SessionRunner(object):
@@ -46,10 +46,13 @@ class SessionRunner(object):
     __project_meta: ProjectMeta = None
     __export: List[Text] = []
     __step_results: List[StepResult] = []
+    __summary_success: bool = True
     __session_variables: VariablesMapping = {}
+    __session_variables_parsed: bool = False
     __is_referenced: bool = False
     # time
     __start_at: float = 0
+    __start_at_iso_format: Text = datetime.utcfromtimestamp(0).isoformat()
     __duration: float = 0
     # log
     __log_path: Text = ""
@@ -61,6 +64,7 @@ class SessionRunner(object):
         self.__config = self.config.struct()
         self.__session_variables = self.__session_variables or {}
         self.__start_at = 0
+        self.__start_at_iso_format = datetime.utcfromtimestamp(0).isoformat()
         self.__duration = 0
         self.__is_referenced = self.__is_referenced or False
 
@@ -76,6 +80,9 @@ class SessionRunner(object):
         self.__log_path = os.path.join(self.root_dir, "logs", f"{self.case_id}.run.log")
 
         self.__step_results = self.__step_results or []
+        self.__summary_success = all(
+            step_result.success for step_result in self.__step_results
+        )
         # 继承requests.Session，初始化SessionData模型，including request, response, validators and stat data
         self.session = self.session or HttpSession()
         # 把function_mapping赋值给self.parser实例
@@ -96,8 +103,14 @@ class SessionRunner(object):
         self.case_id = case_id
         return self
 
-    def with_variables(self, variables: VariablesMapping) -> "SessionRunner":
+    def with_variables(
+        self, variables: VariablesMapping, parsed: bool = False
+    ) -> "SessionRunner":
+        """set session variables, set parsed to true if variables have been parsed,
+        e.g. step variables passed to referenced testcase, thus they are not parsed again.
+        """
         self.__session_variables = variables
+        self.__session_variables_parsed = parsed
         return self
 
     def with_export(self, export: List[Text]) -> "SessionRunner":
@@ -116,11 +129,32 @@ class SessionRunner(object):
     def __parse_config(self, param: Dict = None) -> None:
         # parse config variables，前面step提取的变量更新到config里，或者用例1调用用例2时，执行用例2，会把用例1的config和step变量
         # 更新在这个session里带进来，session的优先级更大
-        self.__config.variables.update(self.__session_variables)
-        if param:
-            self.__config.variables.update(param)
-            # parse_variables_mapping里捕捉了异常
-        self.__config.variables = self.parser.parse_variables(self.__config.variables)
+        # do not update config variables in place, they are shared by config struct
+        if self.__session_variables_parsed:
+            # only parse config variables and params, parsed session variables
+            # can be referenced by them directly
+            param = param or {}
+            parsed_variables = {
+                var_name: var_value
+                for var_name, var_value in self.__session_variables.items()
+                if var_name not in param
+            }
+            config_variables = {
+                var_name: var_value
+                for var_name, var_value in self.__config.variables.items()
+                if var_name not in parsed_variables
+            }
+            config_variables.update(param)
+            self.__config.variables = self.parser.parse_variables(
+                config_variables, parsed_variables
+            )
+        else:
+            config_variables = {
+                **self.__config.variables,
+                **self.__session_variables,
+                **(param or {}),
+            }
+            self.__config.variables = self.parser.parse_variables(config_variables)
 
         # parse config name
         # 要替换的变量在config.variable里没有，会抛出异常，这里没有捕捉异常会直接中断程序报错
@@ -137,45 +171,36 @@ class SessionRunner(object):
         # override testcase export vars with step export
         # self.__export是testcase_step里的export
         export_var_names = self.__export or self.__config.export
-        export_vars_mapping = {}
-        for var_name in export_var_names:
-            # 从__session_variables里取值导出，__session_variables包含step提取的变量
-            # 还有用例1调用用例2时，用例1定义的step和config变量
-            if var_name not in self.__session_variables:
-                raise ParamsError(
-                    f"failed to export variable {var_name} from session variables {self.__session_variables}"
-                )
-
-            export_vars_mapping[var_name] = self.__session_variables[var_name]
-
-        return export_vars_mapping
+        # 从__session_variables里取值导出，__session_variables包含step提取的变量
+        # 还有用例1调用用例2时，用例1定义的step和config变量
+        try:
+            return {
+                var_name: self.__session_variables[var_name]
+                for var_name in export_var_names
+            }
+        except KeyError as ex:
+            raise ParamsError(
+                f"failed to export variable {ex.args[0]} from session variables {self.__session_variables}"
+            )
 
     def get_summary(self) -> TestCaseSummary:
         """get testcase result summary"""
-        start_at_timestamp = self.__start_at
-        start_at_iso_format = datetime.utcfromtimestamp(start_at_timestamp).isoformat()
-
-        summary_success = True
-        for step_result in self.__step_results:
-            if not step_result.success:
-                summary_success = False
-                break
-
-        return TestCaseSummary(
+        # summary is built from runner's own state, skip pydantic validation
+        return TestCaseSummary.model_construct(
             name=self.__config.name,
-            success=summary_success,
+            success=self.__summary_success,
             case_id=self.case_id,
-            time=TestCaseTime(
+            time=TestCaseTime.model_construct(
                 start_at=self.__start_at,
-                start_at_iso_format=start_at_iso_format,
+                start_at_iso_format=self.__start_at_iso_format,
                 duration=self.__duration,
             ),
-            in_out=TestCaseInOut(
-                config_vars=self.__config.variables,
+            in_out=TestCaseInOut.model_construct(
+                config_vars=dict(self.__config.variables),
                 export_vars=self.get_export_variables(),
             ),
             log=self.__log_path,
-            step_results=self.__step_results,
+            step_results=list(self.__step_results),
         )
 
     def merge_step_variables(self, variables: VariablesMapping) -> VariablesMapping:
@@ -184,52 +209,69 @@ class SessionRunner(object):
         # 还包括用例里调用另一个用例，会把当前用例的config变量和step变量传递给另一个用例
         # 用例A调用用例B，用例B step里的变量>用例A过来的变量>用例B的config变量
         # __session_variables指上一步关联过来的变量，上一步可以是testcase也可以是上一个响应提取的变量
-        variables = merge_variables(variables, self.__session_variables)
         # step variables > testcase config variables
-        variables = merge_variables(variables, self.__config.variables)
+        # same as merging twice with merge_variables, but only copy variables once
+        merged_variables = dict(self.__config.variables)
+        for overriding_variables in (self.__session_variables, variables):
+            merged_variables.update(
+                (key, value)
+                for key, value in overriding_variables.items()
+                if not is_self_referenced_variable(key, value)
+            )
 
         # parse variables
         # 把step里的变量和config里解析过的变量再走一遍解析流程
-        return self.parser.parse_variables(variables)
+        return self.parser.parse_variables(merged_variables)
 
-    def __run_step(self, step):
-        """run teststep, step maybe any kind that implements IStep interface
+    def __run_step_once(self, step, step_name: Text) -> StepResult:
+        if ALLURE is not None:
+            with ALLURE.step(f"step: {step_name}"):
+                return step.run(self)
 
-        Args:
-            step (Step): teststep
+        return step.run(self)
 
-        """
-        logger.info(f"run step begin: {step.name()} >>>>>>")
-
-        # run step
+    def __run_step_with_retry(self, step, step_name: Text) -> StepResult:
         for i in range(step.retry_times + 1):
             try:
-                if ALLURE is not None:
-                    with ALLURE.step(f"step: {step.name()}"):
-                        step_result: StepResult = step.run(self)
-                else:
-                    step_result: StepResult = step.run(self)
-                break
+                return self.__run_step_once(step, step_name)
             except ValidationFailure:
                 if i == step.retry_times:
                     raise
                 else:
                     logger.warning(
-                        f"run step {step.name()} validation failed,wait {step.retry_interval} sec and try again"
+                        f"run step {step_name} validation failed,wait {step.retry_interval} sec and try again"
                     )
                     time.sleep(step.retry_interval)
                     logger.info(
-                        f"run step retry ({i + 1}/{step.retry_times} time): {step.name()} >>>>>>"
+                        f"run step retry ({i + 1}/{step.retry_times} time): {step_name} >>>>>>"
                     )
 
+    def __run_step(self, step):
+        """run teststep, step maybe any kind that implements IStep interface
+
+        Args:
+            step (Step): teststep
+
+        """
+        step_name = step.name()
+        logger.info(f"run step begin: {step_name} >>>>>>")
+
+        # run step
+        if not step.retry_times:
+            # no retry by default, run step directly
+            step_result = self.__run_step_once(step, step_name)
+        else:
+            step_result = self.__run_step_with_retry(step, step_name)
+
         # save extracted variables to session variables
         # 在用例1调用用例2的过程中，把用例2里导出变量更新到用例1的runner.__session_variables里
         # step_result.export_vars来自用例2里的runner.__session_variables里，注意是不同的runner实例
         self.__session_variables.update(step_result.export_vars)
         # update testcase summary
         self.__step_results.append(step_result)
+        self.__summary_success = self.__summary_success and step_result.success
 
-        logger.info(f"run step end: {step.name()} <<<<<<\n")
+        logger.info(f"run step end: {step_name} <<<<<<\n")
 
     def test_start(self, param: Dict = None) -> "SessionRunner":
         """main entrance, discovered by pytest"""
@@ -248,22 +290,37 @@ class SessionRunner(object):
         )
 
         # 设置为 "DEBUG" 意味着所有的DEBUG、INFO、WARNING、ERROR和CRITICAL级别的日志都将被记录到指定的位置
-        logger.add(self.__log_path, format=LOGGER_FORMAT, level="DEBUG")
+        # referenced testcase shares case id and log file with its caller, whose sink
+        # already records its logs; messages are written by loguru's background thread
+        log_handler_id = None
+        if not self.__is_referenced:
+            log_handler_id = logger.add(
+                self.__log_path, format=LOGGER_FORMAT, level="DEBUG", enqueue=True
+            )
         self.__start_at = time.time()
+        self.__start_at_iso_format = datetime.utcfromtimestamp(
+            self.__start_at
+        ).isoformat()
+        # wall clock is only reported, duration is measured with monotonic clock
+        start_perf_counter = time.perf_counter()
         try:
             # run step in sequential order
             for step in self.teststeps:
                 self.__run_step(step)
         finally:
+            self.__duration = time.perf_counter() - start_perf_counter
             logger.info(f"generate testcase log: {self.__log_path}")
-            if ALLURE is not None:
-                ALLURE.attach.file(
-                    self.__log_path,
-                    name="all log",
-                    attachment_type=ALLURE.attachment_type.TEXT,
-                )
-
-        self.__duration = time.time() - self.__start_at
+            if log_handler_id is not None:
+                # wait for queued messages to be written and close the log file,
+                # otherwise sinks of finished testcases are kept receiving logs
+                logger.remove(log_handler_id)
+                if ALLURE is not None:
+                    ALLURE.attach.file(
+                        self.__log_path,
+                        name="all log",
+                        attachment_type=ALLURE.attachment_type.TEXT,
+                    )
+
         return self
 
 
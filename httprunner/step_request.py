@@ -80,12 +80,12 @@ def pretty_format(v) -> str:
 
 def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     """run teststep: request"""
-    step_result = StepResult(
+    step_result = StepResult.model_construct(
         name=step.name,
         step_type="request",
         success=False,
     )
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     # 获取debugtalk里可调用函数
     functions = runner.parser.functions_mapping
@@ -96,7 +96,7 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
     # parse variables，替换变量，感觉跟merge那一步重复了，或者prepare这里添加了新的？？
     step_variables = parse_variables_mapping(step_variables, functions)
 
-    request_dict = step.request.dict()
+    request_dict = step.request.model_dump()
     request_dict.pop("upload", None)
     # 替换请求中的变量
     parsed_request_dict = runner.parser.parse_data(request_dict, step_variables)
@@ -202,7 +202,7 @@ def run_step_request(runner: HttpRunner, step: TStep) -> StepResult:
 
         # save step data
         step_result.data = session_data
-        step_result.elapsed = time.time() - start_time
+        step_result.elapsed = time.perf_counter() - start_time
 
     return step_result
 
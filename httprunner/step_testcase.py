@@ -10,7 +10,7 @@ from httprunner.step_request import call_hooks
 
 def run_step_testcase(runner: HttpRunner, step: TStep) -> StepResult:
     """run teststep: referenced testcase"""
-    step_result = StepResult(name=step.name, step_type="testcase")
+    step_result = StepResult.model_construct(name=step.name, step_type="testcase")
     step_variables = runner.merge_step_variables(step.variables)
     step_export = step.export
 
@@ -28,7 +28,7 @@ def run_step_testcase(runner: HttpRunner, step: TStep) -> StepResult:
     ref_case_runner = step.testcase()
     ref_case_runner.set_referenced().with_session(runner.session).with_case_id(
         runner.case_id
-    ).with_variables(step_variables).with_export(step_export).test_start()
+    ).with_variables(step_variables, parsed=True).with_export(step_export).test_start()
     # with_variables把当前步骤的变量和config的变量，更新到runner的__session_variables里
     # 这样才能把当前测试变量传递给另一个test的test_start()里
     # with_export把步骤里声明导出的变量更新到runner的__export里
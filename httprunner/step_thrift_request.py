@@ -53,16 +53,16 @@ def ensure_thrift_ready():
 
 def run_step_thrift_request(runner: HttpRunner, step: TStep) -> StepResult:
     """run teststep:thrift request"""
-    start_time = time.time()
+    start_time = time.perf_counter()
 
-    step_result = StepResult(
+    step_result = StepResult.model_construct(
         name=step.name,
         step_type="thrift",
         success=False,
     )
     step_variables = runner.merge_step_variables(step.variables)
     # parse
-    request_dict = step.thrift_request.dict()
+    request_dict = step.thrift_request.model_dump()
     parsed_request_dict = runner.parser.parse_data(request_dict, step_variables)
     config = runner.get_config()
     parsed_request_dict["psm"] = parsed_request_dict["psm"] or config.thrift.psm
@@ -190,7 +190,7 @@ def run_step_thrift_request(runner: HttpRunner, step: TStep) -> StepResult:
 
         # save step data
         step_result.data = session_data
-        step_result.elapsed = time.time() - start_time
+        step_result.elapsed = time.perf_counter() - start_time
     return step_result
 
 
@@ -23,14 +23,14 @@ from thriftpy2.transport import (
 from httprunner.thrift.data_convertor import json2thrift, thrift2dict
 
 
-class ProtoType(enum.Enum):
+class ProtoType(enum.IntEnum):
     Binary = 1
     CyBinary = 2
     Compact = 3
     Json = 4
 
 
-class TransType(enum.Enum):
+class TransType(enum.IntEnum):
     Buffered = 1
     CyBuffered = 2
     Framed = 3
@@ -1,3 +1,4 @@
+import atexit
 import collections
 import copy
 import itertools
@@ -6,11 +7,13 @@ import os
 import os.path
 import platform
 import random
+import re
 import sys
+import threading
 import time
 import uuid
 from multiprocessing import Queue
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import requests
 import sentry_sdk
@@ -19,6 +22,14 @@ from loguru import logger
 from httprunner import __version__, exceptions
 from httprunner.models import VariablesMapping
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses integers out of 64-bit range as floats, losing precision
+long_digits_regex_compile = re.compile(rb"\d{19}")
+
 
 """ run httpbin as test service
 https://github.com/postmanlabs/httpbin
@@ -54,8 +65,15 @@ def init_sentry_sdk():
 class GA4Client(object):
     """send events to Google Analytics 4 via Measurement Protocol.
     get details in hrp/internal/sdk/ga4.go
+
+    events are queued and sent in batches by a background thread,
+    thus sending events does not block running testcases.
     """
 
+    # Measurement Protocol accepts at most 25 events in one request
+    max_batch_size = 25
+    flush_interval = 5
+
     def __init__(
         self, measurement_id: str, api_secret: str, debug: bool = False
     ) -> None:
@@ -74,6 +92,13 @@ class GA4Client(object):
         # do not send GA events in CI environment
         self.__is_ci = os.getenv("DISABLE_GA") == "true"
 
+        # deque append/popleft are thread-safe
+        self.__events = collections.deque()
+        self.__flush_event = threading.Event()
+        # process owning the queued events, changed in forked child process
+        self.__owner_pid = os.getpid()
+        self.__worker_pid = None
+
     def send_event(self, name: str, event_params: dict = None) -> None:
         if self.__is_ci:
             return
@@ -84,30 +109,88 @@ class GA4Client(object):
             "name": name,
             "params": event_params,
         }
+        self.__ensure_worker()
+        self.__events.append(event)
+
+        if len(self.__events) >= self.max_batch_size:
+            self.__flush_event.set()
+
+    def __ensure_worker(self) -> None:
+        # worker thread is not inherited by forked child process
+        pid = os.getpid()
+        if self.__worker_pid == pid:
+            return
+
+        if self.__owner_pid != pid:
+            # events queued by parent process are sent by parent process itself,
+            # drop them in forked child process to avoid sending them twice
+            self.__owner_pid = pid
+            self.__events.clear()
+            self.__flush_event = threading.Event()
+
+        if self.__worker_pid is None:
+            # send remaining events before process exits, registered handlers
+            # are inherited by forked child process
+            atexit.register(self.__flush_at_exit)
+
+        self.__worker_pid = pid
+        worker = threading.Thread(target=self.__run_worker, name="ga4", daemon=True)
+        worker.start()
+
+    def __run_worker(self) -> None:
+        while True:
+            self.__flush_event.wait(self.flush_interval)
+            self.__flush_event.clear()
+            self.flush()
+
+    def __flush_at_exit(self) -> None:
+        # log sinks may have been closed at interpreter exit, e.g. captured stderr
+        self.flush(quiet=True)
+
+    def flush(self, quiet: bool = False) -> None:
+        """send all queued events, without logging if quiet is true"""
+        if self.__owner_pid != os.getpid():
+            # forked child process without sending any event
+            return
+
+        while self.__events:
+            events = []
+            while len(events) < self.max_batch_size:
+                try:
+                    events.append(self.__events.popleft())
+                except IndexError:
+                    # no more events, or taken by another flush
+                    break
 
+            if events:
+                self.__send_events(events, quiet)
+
+    def __send_events(self, events: List[Dict], quiet: bool = False) -> None:
         payload = {
             "client_id": f"{int(random.random() * 10**8)}.{int(time.time())}",
             "user_id": self.user_id,
             "timestamp_micros": int(time.time() * 10**6),
-            "events": [event],
+            "events": events,
         }
 
-        if self.debug:
+        if self.debug and not quiet:
             logger.debug(f"send GA4 event, uri: {self.uri}, payload: {payload}")
 
         try:
             resp = self.http_client.post(self.uri, json=payload, timeout=5)
         except Exception as err:  # ProxyError, SSLError, ConnectionError
-            logger.error(f"request GA4 failed, error: {err}")
+            if not quiet:
+                logger.error(f"request GA4 failed, error: {err}")
             return
 
         if resp.status_code >= 300:
-            logger.error(
-                f"validation response got unexpected status: {resp.status_code}"
-            )
+            if not quiet:
+                logger.error(
+                    f"validation response got unexpected status: {resp.status_code}"
+                )
             return
 
-        if not self.debug:
+        if not self.debug or quiet:
             return
 
         try:
@@ -282,13 +365,55 @@ class ExtendJSONEncoder(json.JSONEncoder):
             return repr(obj)
 
 
+def json_loads(content: Any) -> Any:
+    """load json content, with orjson if installed.
+    fall back to json for content orjson rejects or loses precision of,
+    e.g. NaN/Infinity and integers out of 64-bit range.
+    """
+    if (
+        orjson is not None
+        and isinstance(content, (bytes, bytearray))
+        and not long_digits_regex_compile.search(content)
+    ):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+
+    return json.loads(content)
+
+
+def json_dumps(obj: Any) -> str:
+    """dump obj to indented json text for logging, with orjson if installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except TypeError:
+            # e.g. bytes or integers out of 64-bit range
+            pass
+
+    return json.dumps(obj, indent=4, ensure_ascii=False, cls=ExtendJSONEncoder)
+
+
+def is_self_referenced_variable(key: str, value: Any) -> bool:
+    """check if variable value only references itself
+    e.g. {"base_url": "$base_url"} or {"base_url": "${base_url}"}
+    """
+    if not isinstance(value, str) or not value.startswith("$"):
+        return False
+
+    return value == f"${key}" or value == "${" + key + "}"
+
+
 def merge_variables(
     variables: VariablesMapping, variables_to_be_overridden: VariablesMapping
 ) -> VariablesMapping:
     """merge two variables mapping, the first variables have higher priority"""
     step_new_variables = {}
     for key, value in variables.items():
-        if f"${key}" == value or "${" + key + "}" == value:
+        if is_self_referenced_variable(key, value):
             # e.g. {"base_url": "$base_url"}
             # or {"base_url": "${base_url}"}
             continue
@@ -314,6 +439,30 @@ def is_support_multiprocessing() -> bool:
         return False
 
 
+def iter_cartesian_product(*args: List[Dict]) -> Iterator[Dict]:
+    """generate cartesian product for lists one by one, without building the whole list
+
+    Args:
+        args (list of list): lists to be generated with cartesian product
+
+    Yields:
+        dict: merged dict of each product item
+
+    """
+    if not args:
+        return
+    elif len(args) == 1:
+        yield from args[0]
+        return
+
+    for product_item_tuple in itertools.product(*args):
+        product_item_dict = {}
+        for item in product_item_tuple:
+            product_item_dict.update(item)
+
+        yield product_item_dict
+
+
 def gen_cartesian_product(*args: List[Dict]) -> List[Dict]:
     """generate cartesian product for lists
 
@@ -339,20 +488,7 @@ def gen_cartesian_product(*args: List[Dict]) -> List[Dict]:
             ]
 
     """
-    if not args:
-        return []
-    elif len(args) == 1:
-        return args[0]
-
-    product_list = []
-    for product_item_tuple in itertools.product(*args):
-        product_item_dict = {}
-        for item in product_item_tuple:
-            product_item_dict.update(item)
-
-        product_list.append(product_item_dict)
-
-    return product_list
+    return list(iter_cartesian_product(*args))
 
 
 LOGGER_FORMAT = (
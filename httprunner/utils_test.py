@@ -1,5 +1,6 @@
 import decimal
 import json
+import math
 import os
 import unittest
 from pathlib import Path
@@ -119,6 +120,27 @@ class TestUtils(unittest.TestCase):
 
         json.dumps(data, cls=ExtendJSONEncoder)
 
+    def test_json_loads_big_int_and_nan(self):
+        self.assertEqual(
+            utils.json_loads(b'{"a": 123456789012345678901234567890}'),
+            {"a": 123456789012345678901234567890},
+        )
+        self.assertEqual(
+            utils.json_loads(b"[18446744073709551616, -9223372036854775809]"),
+            [18446744073709551616, -9223372036854775809],
+        )
+        value = utils.json_loads(b'{"a": NaN, "b": Infinity}')
+        self.assertTrue(math.isnan(value["a"]))
+        self.assertEqual(value["b"], float("inf"))
+        with self.assertRaises(json.JSONDecodeError):
+            utils.json_loads(b"a=1&b=2")
+
+    def test_json_dumps_big_int_and_bytes(self):
+        self.assertEqual(
+            json.loads(utils.json_dumps({"a": 2**70})), {"a": 1180591620717411303424}
+        )
+        self.assertIn("b'abc'", utils.json_dumps({"a": [b"abc"]}))
+
     def test_override_config_variables(self):
         step_variables = {"base_url": "$base_url", "foo1": "bar1"}
         config_variables = {"base_url": "https://postman-echo.com", "foo1": "bar111"}
@@ -148,6 +170,18 @@ class TestUtils(unittest.TestCase):
             ],
         )
 
+    def test_iter_cartesian_product(self):
+        parameters_content_list = [
+            [{"a": 1}, {"a": 2}],
+            [{"x": 111}, {"x": 121}],
+        ]
+        product_iter = utils.iter_cartesian_product(*parameters_content_list)
+        self.assertEqual(next(product_iter), {"a": 1, "x": 111})
+        self.assertEqual(
+            list(product_iter),
+            [{"a": 1, "x": 121}, {"a": 2, "x": 111}, {"a": 2, "x": 121}],
+        )
+
     def test_cartesian_product_empty(self):
         parameters_content_list = []
         product_list = utils.gen_cartesian_product(*parameters_content_list)
@@ -169,3 +203,5 @@ class TestUtils(unittest.TestCase):
                 "b": 456,
             },
         )
+        # events are sent in background, flush to send it within this test
+        ga4_client.flush()